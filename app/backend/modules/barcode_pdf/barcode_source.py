@@ -0,0 +1,95 @@
+import csv
+import itertools
+import os
+
+import pandas as pd
+
+BARCODE_COLUMN = "Szöveg"
+BARCODE_LENGTH = 10
+# CSV/TXT listák ennyi soronként kerülnek beolvasásra
+CHUNK_ROWS = 100_000
+
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+TEXT_EXTENSIONS = (".csv", ".txt")
+
+
+def _missing_column_error():
+    return ValueError(
+        f"A kiválasztott Excel fájl nem tartalmaz '{BARCODE_COLUMN}' nevű oszlopot."
+    )
+
+
+def _to_barcodes(values):
+    # Üres cella (NaN) és üres szöveg nem vonalkód; a csonkolás csak utána
+    values = values.dropna().astype(str).str.strip()
+    return values[values != ""].str[:BARCODE_LENGTH]
+
+
+def _unique_sorted(chunks):
+    # Darabonként egyedi értékek, a végén egyetlen vektorizált összefésülés
+    parts = [chunk.drop_duplicates() for chunk in chunks]
+    if not parts:
+        return []
+    return pd.concat(parts, ignore_index=True).drop_duplicates().sort_values().tolist()
+
+
+def _read_excel_barcodes(path):
+    df = pd.read_excel(
+        path,
+        engine="calamine",
+        usecols=lambda column: column == BARCODE_COLUMN,
+    )
+    if BARCODE_COLUMN not in df.columns:
+        raise _missing_column_error()
+    return _unique_sorted([_to_barcodes(df[BARCODE_COLUMN])])
+
+
+def _iter_txt_chunks(path, chunk_rows):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                return
+            yield _to_barcodes(pd.Series(lines, dtype=object))
+
+
+def _iter_csv_chunks(path, chunk_rows):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(64 * 1024)
+    if not sample.strip():
+        return
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimiter = ","
+    first_row = next(csv.reader([sample.splitlines()[0]], delimiter=delimiter))
+    has_header = BARCODE_COLUMN in [cell.strip() for cell in first_row]
+    reader = pd.read_csv(
+        path,
+        sep=delimiter,
+        encoding="utf-8-sig",
+        dtype=str,
+        header=0 if has_header else None,
+        # Fejléc nélkül az első oszlop a vonalkód lista
+        usecols=(lambda c: str(c).strip() == BARCODE_COLUMN) if has_header else [0],
+        chunksize=chunk_rows,
+        skip_blank_lines=True,
+    )
+    for chunk in reader:
+        yield _to_barcodes(chunk.iloc[:, 0])
+
+
+def read_barcodes(path, chunk_rows=CHUNK_ROWS):
+    """
+    A rendezett, egyedi 10 karakteres vonalkódok listája.
+
+    Excelből csak a "Szöveg" oszlop olvasódik be (calamine). CSV fájlnál a
+    "Szöveg" fejlécű, ennek hiányában az első oszlop, TXT fájlnál soronként
+    egy érték a forrás; ezek chunk_rows soronként, folyamatosan olvasódnak.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".txt":
+        return _unique_sorted(_iter_txt_chunks(path, chunk_rows))
+    if extension == ".csv":
+        return _unique_sorted(_iter_csv_chunks(path, chunk_rows))
+    return _read_excel_barcodes(path)
@@ -0,0 +1,96 @@
+import os
+import shutil
+import uuid
+
+COPY_MODE = "copy"
+LINK_MODE = "link"
+COPY_MODES = (COPY_MODE, LINK_MODE)
+
+# FAT/SMB meghajtókon az mtime csak 2 mp pontossággal tárolódik
+MTIME_TOLERANCE_NS = 2_000_000_000
+
+
+def scan_targets(folder):
+    """A célmappa fájljai: {név: (méret, mtime_ns)}, egyetlen bejárással."""
+    targets = {}
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    st = entry.stat()
+                    targets[entry.name] = (st.st_size, st.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return targets
+
+
+def is_up_to_date(source_stat, target_info):
+    """A cél már megegyezik a forrással (méret és mtime alapján)."""
+    if target_info is None:
+        return False
+    size, mtime_ns = target_info
+    return (
+        size == source_stat.st_size
+        and abs(mtime_ns - source_stat.st_mtime_ns) <= MTIME_TOLERANCE_NS
+    )
+
+
+def _kernel_copy(source, target, size):
+    """
+    Kernel oldali másolás (copy_file_range, ennek hiányában sendfile),
+    ahol a platform és a fájlrendszer támogatja; különben OSError.
+    """
+    copy_range = getattr(os, "copy_file_range", None)
+    sendfile = getattr(os, "sendfile", None)
+    if copy_range is None and sendfile is None:
+        raise OSError("Nincs kernel oldali másolás ezen a platformon.")
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        offset = 0
+        while offset < size:
+            if copy_range is not None:
+                sent = copy_range(src_fd, dst_fd, size - offset)
+            else:
+                sent = sendfile(dst_fd, src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    shutil.copystat(source, target)
+
+
+def link_or_copy(source, target, size):
+    """
+    Hardlinket hoz létre (azonos köteten csak metaadat művelet), ha ez
+    nem lehetséges, kernel oldali másolással, végül shutil.copy2-vel
+    másol. A link a forrással közös tartalmú: a kimenet szerkesztése a
+    forrást is módosítja.
+    """
+    try:
+        if os.path.exists(target) and os.path.samefile(source, target):
+            # Egy korábbi futás már ugyanerre a fájlra linkelt
+            return
+    except OSError:
+        pass
+    # Egyedi név: párhuzamos feladatok ne írják felül egymás ideiglenes linkjét
+    tmp = f"{target}.{uuid.uuid4().hex[:8]}.linktmp"
+    try:
+        os.link(source, tmp)
+        os.replace(tmp, target)
+        return
+    except OSError:
+        pass
+    finally:
+        # Ha a cél már ugyanarra az inode-ra mutatott, a replace nem csinál semmit
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+    try:
+        _kernel_copy(source, target, size)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def copy_file(source, target, size, mode=COPY_MODE):
+    if mode == LINK_MODE:
+        link_or_copy(source, target, size)
+    else:
+        shutil.copy2(source, target)
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import time
+
+JOURNAL_NAME = ".barcode_copy_journal.jsonl"
+
+COPIED = "copied"
+SKIPPED = "skipped"
+
+
+def journal_job_key(pdf_folder, barcodes):
+    """Egy másolási feladat azonosítója: forrás mappa + vonalkód lista."""
+    digest = hashlib.sha1(os.path.abspath(pdf_folder).encode("utf-8"))
+    for barcode in sorted(barcodes):
+        digest.update(b"\0" + str(barcode).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CopyJournal:
+    """
+    Hozzáfűzős napló a kimeneti mappában a már elkészült másolatokról.
+
+    Egy megszakított (vagy hibával leállt) feladat újraindításakor a
+    naplóban szereplő fájlok ellenőrzés és másolás nélkül kimaradnak. A
+    sikeresen befejezett, vagy más feladathoz tartozó napló helyett új
+    kezdődik.
+    """
+
+    def __init__(self, output_folder, job_key):
+        self.path = os.path.join(output_folder, JOURNAL_NAME)
+        self.job_key = job_key
+        self.completed = {}
+        self.sessions = 0
+        resume = self._load()
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+        if resume and not self._ends_with_newline():
+            self._file.write("\n")
+        self.sessions += 1
+        self._write({"event": "session", "job": job_key, "started": time.time()})
+
+    def _load(self):
+        """True, ha a meglévő napló folytatható."""
+        completed = {}
+        sessions = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Félbemaradt utolsó sor (leállás írás közben)
+                        continue
+                    event = entry.get("event")
+                    if event == "session":
+                        if entry.get("job") != self.job_key:
+                            return False
+                        sessions += 1
+                    elif event == "complete":
+                        return False
+                    elif event == "file":
+                        completed[entry["name"]] = entry["status"]
+        except FileNotFoundError:
+            return False
+        self.completed = completed
+        self.sessions = sessions
+        return sessions > 0
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def record(self, name, status):
+        self.completed[name] = status
+        self._write({"event": "file", "name": name, "status": status})
+
+    def finish(self, complete):
+        if complete:
+            self._write({"event": "complete", "finished": time.time()})
+        self.close()
+
+    def close(self):
+        if not self._file.closed:
+            try:
+                os.fsync(self._file.fileno())
+            except OSError:
+                pass
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,9 +1,18 @@
 from dataclasses import dataclass, field
+from typing import Any
 
 
 @dataclass(slots=True)
 class BarcodeCopyResult:
     copied_count: int = 0
+    skipped_count: int = 0
     missing_count: int = 0
     missing_barcodes: list[str] = field(default_factory=list)
     cancelled: bool = False
+    bytes_copied: int = 0
+    seconds: float = 0.0
+    mb_per_sec: float = 0.0
+    files_per_sec: float = 0.0
+    resumed_count: int = 0
+    sessions: int = 1
+    stats: dict[str, Any] = field(default_factory=dict)
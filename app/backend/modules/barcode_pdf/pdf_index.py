@@ -0,0 +1,129 @@
+import json
+import os
+from collections import deque
+
+from app.backend.services.file_service import atomic_write
+
+# Ennyi mappa indexe marad meg a lemezes cache-ben
+MAX_CACHED_INDEXES = 10
+
+
+def _name_key(name, case_insensitive=None):
+    # None: a fájlrendszer szokása szerint (Windowson kis-nagybetű független)
+    if case_insensitive is None:
+        return os.path.normcase(name)
+    return name.casefold() if case_insensitive else name
+
+
+def _is_pdf(name, case_insensitive=None):
+    return _name_key(name, case_insensitive).endswith(_name_key(".pdf", case_insensitive))
+
+
+class PdfIndex:
+    """
+    Egy mappa (és rekurzív módban az almappái) PDF fájljai név szerint.
+    A dir_mtimes a bejárt mappák módosítási ideje, ez alapján dönthető
+    el, hogy az index még érvényes-e.
+    """
+
+    def __init__(self, files, dir_mtimes, case_insensitive=None):
+        self.files = files
+        self.dir_mtimes = dir_mtimes
+        self.case_insensitive = case_insensitive
+
+    def find(self, file_name):
+        return self.files.get(_name_key(file_name, self.case_insensitive))
+
+    def __len__(self):
+        return len(self.files)
+
+    def is_current(self):
+        for path, mtime_ns in self.dir_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+
+def build_pdf_index(folder, recursive=False, case_insensitive=None, is_cancelled=None):
+    """
+    Egyetlen os.scandir bejárással építi fel a PDF indexet. Rekurzív
+    módban szélességi sorrendben halad, így azonos nevű fájloknál a
+    gyökérhez közelebbi nyer.
+    """
+    files = {}
+    dir_mtimes = {}
+    queue = deque([folder])
+    while queue:
+        if is_cancelled and is_cancelled():
+            return None
+        directory = queue.popleft()
+        dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+        subdirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and _is_pdf(entry.name, case_insensitive):
+                    files.setdefault(_name_key(entry.name, case_insensitive), entry.path)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        queue.extend(sorted(subdirs))
+    return PdfIndex(files, dir_mtimes, case_insensitive)
+
+
+class PdfIndexCache:
+    """
+    Mappánként megjegyzett PDF indexek (memóriában és JSON fájlban). Egy
+    index addig használható, amíg egyik bejárt mappa mtime-ja sem változik.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._memory = {}
+
+    @staticmethod
+    def _key(folder, recursive, case_insensitive):
+        return f"{os.path.abspath(folder)}|{int(bool(recursive))}|{case_insensitive}"
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def get(self, folder, recursive=False, case_insensitive=None):
+        key = self._key(folder, recursive, case_insensitive)
+        index = self._memory.get(key)
+        if index is None:
+            entry = self._read().get(key)
+            if entry is not None:
+                index = PdfIndex(entry["files"], entry["dir_mtimes"], case_insensitive)
+        if index is None or not index.is_current():
+            return None
+        self._memory[key] = index
+        return index
+
+    def put(self, folder, index, recursive=False):
+        key = self._key(folder, recursive, index.case_insensitive)
+        self._memory[key] = index
+        data = self._read()
+        data.pop(key, None)
+        data[key] = {"files": index.files, "dir_mtimes": index.dir_mtimes}
+        for old_key in list(data)[:-MAX_CACHED_INDEXES]:
+            del data[old_key]
+        with atomic_write(self.path, encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def get_or_build(self, folder, recursive=False, case_insensitive=None, is_cancelled=None):
+        index = self.get(folder, recursive, case_insensitive)
+        if index is not None:
+            return index
+        index = build_pdf_index(folder, recursive, case_insensitive, is_cancelled)
+        if index is not None:
+            try:
+                self.put(folder, index, recursive)
+            except OSError:
+                pass
+        return index
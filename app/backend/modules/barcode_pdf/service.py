@@ -1,55 +1,277 @@
 import os
-import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-import pandas as pd
+from app.backend.modules.barcode_pdf.barcode_source import read_barcodes
+from app.backend.modules.barcode_pdf.file_copy import (
+    COPY_MODE,
+    COPY_MODES,
+    copy_file,
+    is_up_to_date,
+    scan_targets,
+)
+from app.backend.modules.barcode_pdf.journal import (
+    COPIED,
+    SKIPPED,
+    CopyJournal,
+    journal_job_key,
+)
+from app.backend.modules.barcode_pdf.pdf_index import PdfIndexCache
+from app.backend.services.perf_service import Tracer
+from app.backend.workers.progress import ProgressReporter
+from app.config.paths import module_cache_dir
+from app.config.settings import BARCODE_COPY_MODE, BARCODE_COPY_WORKERS
+
+PDF_INDEX_CACHE = PdfIndexCache(module_cache_dir("barcode_pdf") / "pdf_index.json")
+MB = 1024 * 1024
+PREVIEW_HEADER = ["Vonalkód", "Fájl", "Állapot"]
 
 
 def copy_matching_pdfs(
-    excel_path, pdf_folder, output_folder, progress_callback=None, is_cancelled=None
+    excel_path,
+    pdf_folder,
+    output_folder,
+    progress_callback=None,
+    is_cancelled=None,
+    recursive=False,
+    case_insensitive=None,
+    workers=BARCODE_COPY_WORKERS,
+    incremental=True,
+    copy_mode=BARCODE_COPY_MODE,
+    partial_callback=None,
 ):
-    if progress_callback:
-        progress_callback("Excel beolvasása...", 0, 0)
+    """
+    Az Excel "Szöveg" oszlopának első 10 karaktere (vonalkód) alapján
+    átmásolja a pdf_folder megfelelő PDF-jeit az output_folder-be. Az
+    excel_path CSV/TXT vonalkód lista is lehet (lásd read_barcodes).
 
-    df = pd.read_excel(excel_path)
+    A PDF mappa egyszer kerül bejárásra (recursive esetén az almappák is),
+    a vonalkódok ebben az indexben keresődnek; case_insensitive=None
+    esetén a fájlrendszer szabálya szerint. Az index a mappák mtime-jával
+    együtt cache-elődik, így változatlan mappánál újra sem kell bejárni.
 
-    if "Szöveg" not in df.columns:
-        raise ValueError(
-            "A kiválasztott Excel fájl nem tartalmaz 'Szöveg' nevű oszlopot."
-        )
+    A másolás workers párhuzamos szálon fut (hálózati meghajtón a
+    fájlonkénti késleltetés így átfedhető); az eredmény az átviteli
+    sebességet (MB/s, fájl/s) is tartalmazza.
 
-    os.makedirs(output_folder, exist_ok=True)
+    incremental esetén a kimeneti mappában már azonos méretű és mtime-ú
+    fájlok kimaradnak (skipped_count). copy_mode="link" esetén hardlink,
+    ill. kernel oldali másolás készül a shutil.copy2 helyett.
 
-    df["Vonalkód"] = df["Szöveg"].astype(str).str[:10]
-    barcodes = sorted(set(df["Vonalkód"].dropna()))
+    A kimeneti mappában napló (CopyJournal) rögzíti az elkészült fájlokat:
+    egy megszakított feladat újraindításkor innen folytatódik, a copied_count
+    és skipped_count az összes munkamenetet összesíti (resumed_count: a
+    naplóból átvett fájlok, sessions: a munkamenetek száma). A bytes_copied
+    és a sebesség értékek az aktuális munkamenetre vonatkoznak.
 
-    copied_count = 0
-    missing_barcodes = []
-    total = len(barcodes)
+    A partial_callback (PREVIEW_HEADER sorok) előbb a hiányzó vonalkódokat,
+    majd a másolás közben az elkészült / kihagyott fájlokat kapja.
+    """
+    if copy_mode not in COPY_MODES:
+        raise ValueError(f"Ismeretlen másolási mód: {copy_mode}")
+    progress_callback = ProgressReporter.wrap(progress_callback)
+    with Tracer("barcode_pdf", source=os.path.basename(excel_path)) as tracer:
+        if progress_callback:
+            progress_callback("Vonalkódok beolvasása...", 0, 0)
+        with tracer.span("vonalkodok_olvasasa") as span:
+            barcodes = read_barcodes(excel_path)
+            span.rows = len(barcodes)
 
-    for index, barcode in enumerate(barcodes, start=1):
-        if is_cancelled and is_cancelled():
-            return {
-                "copied_count": copied_count,
-                "missing_count": len(missing_barcodes),
-                "missing_barcodes": missing_barcodes,
-                "cancelled": True,
-            }
+        os.makedirs(output_folder, exist_ok=True)
 
         if progress_callback:
-            progress_callback("PDF-ek másolása...", index, total)
+            progress_callback("PDF mappa beolvasása...", 0, 0)
+        with tracer.span("pdf_index"):
+            pdf_index = PDF_INDEX_CACHE.get_or_build(
+                pdf_folder, recursive, case_insensitive, is_cancelled
+            )
 
-        pdf_name = f"{barcode}.pdf"
-        pdf_path = os.path.join(pdf_folder, pdf_name)
+        if pdf_index is None:
+            tracer.status = "cancelled"
+            result = _copy_result(0, [], True)
+            result["stats"] = tracer.stats()
+            return result
 
-        if os.path.isfile(pdf_path):
-            shutil.copy2(pdf_path, os.path.join(output_folder, pdf_name))
-            copied_count += 1
-        else:
-            missing_barcodes.append(str(barcode))
+        jobs = []
+        missing_barcodes = []
+        for barcode in barcodes:
+            pdf_path = pdf_index.find(f"{barcode}.pdf")
+            if pdf_path is not None:
+                target = os.path.join(output_folder, os.path.basename(pdf_path))
+                jobs.append((str(barcode), pdf_path, target))
+            else:
+                missing_barcodes.append(str(barcode))
+        if partial_callback and missing_barcodes:
+            partial_callback(
+                PREVIEW_HEADER,
+                [[barcode, "", "Hiányzik"] for barcode in missing_barcodes],
+            )
 
+        with tracer.span("cel_mappa"):
+            targets = scan_targets(output_folder)
+        with (
+            tracer.span("masolas") as span,
+            CopyJournal(output_folder, journal_job_key(pdf_folder, barcodes)) as journal,
+        ):
+            # Csak a naplóban szereplő és ténylegesen meglévő célok maradnak ki
+            resumed = {
+                name: status
+                for name, status in journal.completed.items()
+                if name in targets
+            }
+            jobs = [job for job in jobs if os.path.basename(job[2]) not in resumed]
+            span.rows = len(jobs)
+            result = _copy_jobs(
+                jobs,
+                missing_barcodes,
+                workers,
+                progress_callback,
+                is_cancelled,
+                targets=targets if incremental else {},
+                copy_mode=copy_mode,
+                journal=journal,
+                partial_callback=partial_callback,
+            )
+            # Csak akkor kész, ha minden sorba állított fájl bekerült a naplóba
+            # (a közben eltűnt forrásfájlok hiányzóként számítanak)
+            missing = set(result["missing_barcodes"])
+            journal.finish(
+                all(
+                    os.path.basename(target) in journal.completed or barcode in missing
+                    for barcode, _, target in jobs
+                )
+            )
+
+        statuses = list(resumed.values())
+        result["copied_count"] += statuses.count(COPIED)
+        result["skipped_count"] += statuses.count(SKIPPED)
+        result["resumed_count"] = len(resumed)
+        result["sessions"] = journal.sessions
+        if result["cancelled"]:
+            tracer.status = "cancelled"
+        result["stats"] = tracer.stats()
+        return result
+
+
+def _copy_result(
+    copied_count, missing_barcodes, cancelled, bytes_copied=0, seconds=0.0, skipped_count=0
+):
     return {
         "copied_count": copied_count,
+        "skipped_count": skipped_count,
         "missing_count": len(missing_barcodes),
         "missing_barcodes": missing_barcodes,
-        "cancelled": False,
+        "cancelled": cancelled,
+        "bytes_copied": bytes_copied,
+        "seconds": seconds,
+        "mb_per_sec": bytes_copied / MB / seconds if seconds > 0 else 0.0,
+        "files_per_sec": copied_count / seconds if seconds > 0 else 0.0,
+        "resumed_count": 0,
+        "sessions": 1,
     }
+
+
+def _file_stat(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _copy_one(source, target, size, copy_mode, is_cancelled=None):
+    # Worker szálban fut; a még el nem kezdett fájlok megszakításkor kimaradnak
+    if is_cancelled and is_cancelled():
+        return False
+    copy_file(source, target, size, copy_mode)
+    return True
+
+
+def _copy_jobs(
+    jobs,
+    missing_barcodes,
+    workers,
+    progress_callback,
+    is_cancelled,
+    targets=None,
+    copy_mode=COPY_MODE,
+    journal=None,
+    partial_callback=None,
+):
+    """
+    A (vonalkód, forrás, cél) másolásokat legfeljebb workers szálon végzi.
+    A targets (scan_targets) szerint már naprakész célok kimaradnak, az
+    elkészült fájlok a journal-ba (CopyJournal) is bekerülnek.
+    A progress a másolt adatmennyiséget mutatja (KB-ban, hogy nagy
+    kötegeknél se lépje túl a Qt int tartományát).
+    """
+    started = time.perf_counter()
+    copied_count = 0
+    skipped_count = 0
+    bytes_copied = 0
+    cancelled = False
+    targets = targets or {}
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        if progress_callback:
+            progress_callback("Fájlméretek lekérdezése...", 0, 0)
+        stats = list(executor.map(_file_stat, (source for _, source, _ in jobs)))
+        present = []
+        preview = []
+        for job, st in zip(jobs, stats):
+            if st is None:
+                missing_barcodes.append(job[0])
+                preview.append([job[0], "", "Hiányzik"])
+            elif is_up_to_date(st, targets.get(os.path.basename(job[2]))):
+                skipped_count += 1
+                if journal is not None:
+                    journal.record(os.path.basename(job[2]), SKIPPED)
+                preview.append([job[0], os.path.basename(job[2]), "Naprakész"])
+            else:
+                present.append((job, st.st_size))
+        if partial_callback and preview:
+            partial_callback(PREVIEW_HEADER, preview)
+        missing_barcodes.sort()
+        total_kb = max(1, sum(size for _, size in present) // 1024)
+
+        pending = {
+            executor.submit(_copy_one, source, target, size, copy_mode, is_cancelled): (
+                barcode,
+                os.path.basename(target),
+                size,
+            )
+            for (barcode, source, target), size in present
+        }
+        while pending:
+            if is_cancelled and is_cancelled():
+                cancelled = True
+                for future in pending:
+                    future.cancel()
+            finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                barcode, name, size = pending.pop(future)
+                if future.cancelled() or not future.result():
+                    # A worker a megszakítás miatt hagyta ki a fájlt
+                    cancelled = True
+                    continue
+                if journal is not None:
+                    journal.record(name, COPIED)
+                if partial_callback:
+                    partial_callback(PREVIEW_HEADER, [[barcode, name, "Átmásolva"]])
+                copied_count += 1
+                bytes_copied += size
+                if progress_callback:
+                    progress_callback("PDF-ek másolása...", bytes_copied // 1024, total_kb)
+        # Az utolsó fájlok a wait() alatt is elkészülhettek a jelzés után
+        if is_cancelled and is_cancelled():
+            cancelled = True
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return _copy_result(
+        copied_count,
+        missing_barcodes,
+        cancelled,
+        bytes_copied,
+        time.perf_counter() - started,
+        skipped_count,
+    )
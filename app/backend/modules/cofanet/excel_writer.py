@@ -1,7 +1,5 @@
-import csv
 import os
 import re
-import sys
 import unicodedata
 from difflib import SequenceMatcher
 
@@ -42,37 +40,22 @@ def best_fuzzy_match(vevo_name, coface_names, threshold=0.80):
     return None
 
 
-def format_amount(amount_str):
-    """
-    Formázza az összeget helyes számformátumra:
-    - ezres elválasztó: vessző
-    - tizedes jel: pont
-    - excel cellába számként kerül be
-    """
-    if not amount_str:
-        return None, ""
-    amt = amount_str.replace(" ", "")
-    if "," in amt and amt.count(",") == 1:
-        amt = amt.replace(".", "")
-        amt = amt.replace(",", ".")
-    elif amt.count(".") > 1 and "," not in amt:
-        parts = amt.split(".")
-        tizedes = parts[-1]
-        amt = "".join(parts[:-1]) + "." + tizedes
-    try:
-        num = float(amt)
-        # Sztring formázás: 1,234,567.89
-        str_formatted = f"{num:,.2f}"
-        return num, str_formatted
-    except Exception:
-        return None, amount_str
-
-
-def find_row_for_company(vevo_name, coface_names):
+def find_row_for_company(vevo_name, coface_names, match_cache=None):
     vevo_name_lower = vevo_name.lower().strip()
     for idx, name in enumerate(coface_names):
         if vevo_name_lower == name.lower().strip():
             return idx
+    if match_cache is not None:
+        hit, idx = match_cache.lookup(vevo_name)
+        if hit:
+            return idx
+    idx = _find_row_fuzzy(vevo_name, vevo_name_lower, coface_names)
+    if match_cache is not None:
+        match_cache.store(vevo_name, coface_names[idx] if idx is not None else None)
+    return idx
+
+
+def _find_row_fuzzy(vevo_name, vevo_name_lower, coface_names):
     idx = best_fuzzy_match(vevo_name, coface_names, threshold=0.80)
     if idx is not None:
         return idx
@@ -84,21 +67,29 @@ def find_row_for_company(vevo_name, coface_names):
     return None
 
 
-def fill_coface_excel_and_open(
-    coface_excel_path,
-    vevok_csv_path,
-    save_path=None,
-    progress_callback=None,
-    is_cancelled=None,
-    open_file=True,
-):
-    with open(vevok_csv_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        vevok_data = [
-            (row.get("Vevő", "").strip(), row.get("Forintosítva HUF", ""))
-            for row in reader
-        ]
+def _write_amount(cell, amount):
+    if isinstance(amount, (int, float)):
+        cell.value = amount
+        cell.number_format = numbers.FORMAT_NUMBER_COMMA_SEPARATED1  # '1,234,567.89'
+    else:
+        cell.value = amount
 
+
+def default_output_path(coface_excel_path):
+    """Mentési hely, ha a felhasználó nem választott: a Coface Excel mellé."""
+    return os.path.join(os.path.dirname(coface_excel_path), "coface_output.xlsx")
+
+
+def _save_workbook(wb, coface_excel_path, save_path=None, progress_callback=None):
+    # --- MENTÉS FELHASZNÁLÓ ÁLTAL VÁLASZTOTT HELYRE ---
+    output_path = save_path or default_output_path(coface_excel_path)
+    if progress_callback:
+        progress_callback("Coface Excel mentése...", 0, 0)
+    wb.save(output_path)
+    return output_path
+
+
+def _open_active_sheet(coface_excel_path, progress_callback=None):
     if progress_callback:
         progress_callback("Coface Excel megnyitása...", 0, 0)
 
@@ -106,6 +97,27 @@ def fill_coface_excel_and_open(
     ws = wb.active
     if ws is None:
         raise Exception("Nem sikerült megnyitni az aktív munkalapot!")
+    return wb, ws
+
+
+def fill_coface_excel(
+    coface_excel_path,
+    customers,
+    save_path=None,
+    progress_callback=None,
+    is_cancelled=None,
+    match_cache=None,
+    matched_cells=None,
+):
+    """
+    Kitölti a Coface Excel 'Számlázott összeg' oszlopát.
+    A customers (vevő név, összeg) párok listája; a float összeg számként,
+    minden más érték változatlanul kerül a cellába.
+    A match_cache (MatchCache) megadásával a korábbi párosítások
+    fuzzy keresés nélkül újrahasznosulnak. Ha matched_cells lista meg van
+    adva, (vevő index, cella koordináta) párokkal töltődik fel.
+    """
+    wb, ws = _open_active_sheet(coface_excel_path, progress_callback)
 
     header_row_idx, header = None, []
     for i, row in enumerate(ws.iter_rows(min_row=1, max_row=10), 1):
@@ -121,50 +133,45 @@ def fill_coface_excel_and_open(
 
     coface_rows = list(ws.iter_rows(min_row=header_row_idx + 1, max_row=ws.max_row))
     coface_names = [str(row[cegnev_col].value or "").strip() for row in coface_rows]
+    if match_cache is not None:
+        match_cache.bind(coface_names)
 
     from openpyxl.cell.cell import MergedCell
 
-    total_vevok = len(vevok_data)
-    for index, (vevo_name, amount) in enumerate(vevok_data, start=1):
+    total_vevok = len(customers)
+    for index, (vevo_name, amount) in enumerate(customers, start=1):
         if is_cancelled and is_cancelled():
             raise InterruptedError("A feldolgozás megszakítva.")
         if progress_callback:
             progress_callback("Coface cégek párosítása...", index, total_vevok)
         if not vevo_name:
             continue
-        idx = find_row_for_company(vevo_name, coface_names)
+        idx = find_row_for_company(vevo_name, coface_names, match_cache=match_cache)
         if idx is not None:
             target_row = coface_rows[idx]
             cell = target_row[osszeg_col]
             if not isinstance(cell, MergedCell):
-                num_value, str_formatted = format_amount(amount)
-                if num_value is not None:
-                    cell.value = num_value
-                    cell.number_format = (
-                        numbers.FORMAT_NUMBER_COMMA_SEPARATED1
-                    )  # '1,234,567.89'
-                else:
-                    cell.value = amount
+                _write_amount(cell, amount)
+                if matched_cells is not None:
+                    matched_cells.append((index - 1, cell.coordinate))
 
-    # --- MENTÉS FELHASZNÁLÓ ÁLTAL VÁLASZTOTT HELYRE ---
-    if save_path is None:
-        output_path = os.path.join(
-            os.path.dirname(coface_excel_path), "coface_output.xlsx"
-        )
-    else:
-        output_path = save_path
-    if progress_callback:
-        progress_callback("Coface Excel mentése...", 0, 0)
-    wb.save(output_path)
-    if open_file:
-        try:
-            if sys.platform.startswith("darwin"):
-                os.system(f'open "{output_path}"')
-            elif os.name == "nt":
-                os.startfile(output_path)
-            else:
-                os.system(f'xdg-open "{output_path}"')
-        except Exception:
-            pass
+    return _save_workbook(wb, coface_excel_path, save_path, progress_callback)
 
-    return output_path
+
+def apply_coface_amounts(
+    coface_excel_path,
+    cell_amounts,
+    save_path=None,
+    progress_callback=None,
+    is_cancelled=None,
+):
+    """
+    Párosítás nélkül írja be az összegeket egy korábbi futásból ismert
+    cellákba. A cell_amounts (cella koordináta, összeg) párok listája.
+    """
+    wb, ws = _open_active_sheet(coface_excel_path, progress_callback)
+    if is_cancelled and is_cancelled():
+        raise InterruptedError("A feldolgozás megszakítva.")
+    for coordinate, amount in cell_amounts:
+        _write_amount(ws[coordinate], amount)
+    return _save_workbook(wb, coface_excel_path, save_path, progress_callback)
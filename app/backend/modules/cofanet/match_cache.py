@@ -0,0 +1,125 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+
+# A kulcs képzésének változásakor emelendő: a régi bejegyzések törlődnek
+CACHE_VERSION = 2
+
+
+def customer_key(vevo_name):
+    """
+    A vevőnév kulcsa: kisbetűs, egységes szóközökkel. A normalize_name nem
+    jó kulcsnak, mert a cégformát is elhagyja ("X Kft." és "X Zrt." egy
+    kulcs lenne).
+    """
+    return " ".join(str(vevo_name).split()).casefold()
+
+
+def coface_fingerprint(coface_names):
+    digest = hashlib.sha1()
+    for name in coface_names:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class MatchCache:
+    """
+    Tartós vevő -> Coface cégnév párosítás cache (SQLite).
+
+    A kulcs a vevőnév (customer_key). Egy talált párosítás addig érvényes,
+    amíg a Coface cég szerepel a munkafüzetben; ha eltűnik, a bejegyzés
+    törlődik. A "nincs találat" eredmény csak ugyanarra a Coface listára
+    (fingerprint) érvényes, mert egy új cég később illeszkedhet.
+    """
+
+    def __init__(self, db_path, timeout=30.0):
+        self.db_path = str(db_path)
+        # Több Cofanet feladat is futhat egyszerre: WAL módban az olvasás nem
+        # vár az írásra, és minden írás azonnal commitolódik, így az írási
+        # zár nem marad fenn a teljes párosítás alatt
+        self._conn = sqlite3.connect(self.db_path, timeout=timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            # Régebbi (normalizált nevű) kulcsok: a tábla újrakezdődik
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS match_cache")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS match_cache (
+                customer_key TEXT PRIMARY KEY,
+                coface_name TEXT,
+                fingerprint TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._fingerprint = ""
+        self._name_index = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, coface_names):
+        self._fingerprint = coface_fingerprint(coface_names)
+        self._name_index = {}
+        for idx, name in enumerate(coface_names):
+            self._name_index.setdefault(name, idx)
+
+    def lookup(self, vevo_name):
+        """
+        (hit, idx) párt ad vissza. Ha hit igaz, idx a cache-elt sorindex
+        (None = ismert "nincs találat").
+        """
+        key = customer_key(vevo_name)
+        row = self._conn.execute(
+            "SELECT coface_name, fingerprint FROM match_cache WHERE customer_key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+        coface_name, fingerprint = row
+        if coface_name is None:
+            if fingerprint == self._fingerprint:
+                self.hits += 1
+                return True, None
+        else:
+            idx = self._name_index.get(coface_name)
+            if idx is not None:
+                self.hits += 1
+                return True, idx
+        with self._conn:
+            self._conn.execute("DELETE FROM match_cache WHERE customer_key = ?", (key,))
+        self.misses += 1
+        return False, None
+
+    def store(self, vevo_name, coface_name):
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO match_cache
+                    (customer_key, coface_name, fingerprint, updated_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    customer_key(vevo_name),
+                    coface_name,
+                    self._fingerprint,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    def close(self):
+        try:
+            self._conn.commit()
+        finally:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -7,3 +7,13 @@ class CofanetResult:
     rows_count: int
     vevok_csv_path: str | None
     coface_output_path: str | None
+
+
+@dataclass(slots=True)
+class CustomerAmount:
+    name: str
+    amount_bp: float
+    currency_bp: str
+    amount_sp: float
+    currency_sp: str
+    amount_huf: float
@@ -1,12 +1,13 @@
 import re
 
 
-def extract_invoice_summary(filename, progress_callback=None, is_cancelled=None):
+def summarize_invoices(filename, progress_callback=None, is_cancelled=None):
     """
     Csak a 'Név' és minden '** Számla' sort gyűjti ki.
     Minden '** Számla' sorhoz hozzárendeli a legutóbbi 'Név' értéket,
     és pontosan kiolvassa az összegeket a sor végéről.
     A 'praktiker' cégeket összevonja 'Praktiker Kft.' név alá, összegeiket összeadja.
+    Az összegek float-ként (2 tizedesre kerekítve) térnek vissza.
     """
     encodings = ["utf-16", "utf-8"]
     results = []
@@ -94,35 +95,21 @@ def extract_invoice_summary(filename, progress_callback=None, is_cancelled=None)
         if not summarized[key]["sp_penznem"]:
             summarized[key]["sp_penznem"] = row["sp_penznem"]
 
-    # Visszaalakítjuk magyar formátumra
-    def format_hu(val):
-        return f"{val:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-    output_rows = []
-    for data in summarized.values():
-        output_rows.append(
-            {
-                "cegnev": data["cegnev"],
-                "osszeg_bp": format_hu(data["osszeg_bp"]),
-                "bp_penznem": data["bp_penznem"],
-                "osszeg_sp": format_hu(data["osszeg_sp"]),
-                "sp_penznem": data["sp_penznem"],
-            }
-        )
+    output_rows = [
+        {
+            "cegnev": data["cegnev"],
+            "osszeg_bp": round(data["osszeg_bp"], 2),
+            "bp_penznem": data["bp_penznem"],
+            "osszeg_sp": round(data["osszeg_sp"], 2),
+            "sp_penznem": data["sp_penznem"],
+        }
+        for data in summarized.values()
+    ]
 
     # Betűrendbe rendezés cégnév szerint
     output_rows.sort(key=lambda x: x["cegnev"].lower())
     return output_rows
 
 
-def write_vevok_csv(results, output_path):
-    import csv
-
-    with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(
-            csvfile,
-            fieldnames=["cegnev", "osszeg_bp", "bp_penznem", "osszeg_sp", "sp_penznem"],
-        )
-        writer.writeheader()
-        for row in results:
-            writer.writerow(row)
+def format_hu(val):
+    return f"{val:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+
+
+def load_run_state(state_path, sap_hash, coface_hash):
+    """
+    Az előző futás összesítését és párosításait adja vissza, ha a SAP és
+    a Coface bemenet tartalma (hash) azonos, különben None-t.
+    """
+    if not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception:
+        return None
+    if state.get("sap_hash") != sap_hash or state.get("coface_hash") != coface_hash:
+        return None
+    return state
+
+
+def save_run_state(state_path, sap_hash, coface_hash, summary_rows, matched_cells):
+    state = {
+        "sap_hash": sap_hash,
+        "coface_hash": coface_hash,
+        "summary_rows": summary_rows,
+        "matched_cells": [[idx, coordinate] for idx, coordinate in matched_cells],
+    }
+    # Egyedi ideiglenes fájl: párhuzamos futások nem írják egymás tmp-jét.
+    # Az állapot csak gyorsítás, mentési hiba nem rontja el a futást.
+    try:
+        fd, tmp = tempfile.mkstemp(
+            prefix=".last_run.", suffix=".tmp", dir=os.path.dirname(state_path) or "."
+        )
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, state_path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return False
+    return True
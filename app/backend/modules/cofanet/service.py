@@ -1,11 +1,34 @@
 import csv
 import os
-
-from app.config.paths import module_output_dir
-from app.backend.modules.cofanet.excel_writer import fill_coface_excel_and_open
-from app.backend.modules.cofanet.parser import extract_invoice_summary
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config.paths import module_cache_dir, module_output_dir
+from app.backend.modules.cofanet.excel_writer import (
+    apply_coface_amounts,
+    default_output_path,
+    fill_coface_excel,
+)
+from app.backend.modules.cofanet.match_cache import MatchCache
+from app.backend.modules.cofanet.models import CustomerAmount
+from app.backend.modules.cofanet.parser import format_hu, summarize_invoices
+from app.backend.modules.cofanet.run_state import load_run_state, save_run_state
+from app.backend.services.file_service import file_sha256
+from app.backend.services.perf_service import Tracer
+from app.backend.services.workspace_service import JobWorkspace
+from app.backend.workers.progress import ProgressReporter
 
 OUTPUT_DIR = str(module_output_dir("cofanet"))
+MATCH_CACHE_PATH = str(module_cache_dir("cofanet") / "match_cache.sqlite")
+RUN_STATE_PATH = str(module_cache_dir("cofanet") / "last_run.json")
+
+VEVOK_CSV_HEADERS = [
+    "Vevő",
+    "Összeg BP-ben",
+    "BP pénznem",
+    "Összeg SP-ben",
+    "SP pénznem",
+    "Forintosítva HUF",
+]
 
 
 def _raise_if_cancelled(is_cancelled=None):
@@ -13,93 +36,186 @@ def _raise_if_cancelled(is_cancelled=None):
         raise InterruptedError("A feldolgozás megszakítva.")
 
 
-def _format_hu_amount(value):
-    return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+def build_customer_amounts(summary_rows, eur_rate, is_cancelled=None):
+    customers = []
+    for row in sorted(summary_rows, key=lambda x: x["cegnev"].lower()):
+        _raise_if_cancelled(is_cancelled)
+        amount_bp = row.get("osszeg_bp") or 0.0
+        currency_bp = row.get("bp_penznem", "")
+        if currency_bp.upper() != "HUF":
+            amount_huf = round(amount_bp * eur_rate, 2)
+        else:
+            amount_huf = amount_bp
+        customers.append(
+            CustomerAmount(
+                name=row.get("cegnev", ""),
+                amount_bp=amount_bp,
+                currency_bp=currency_bp,
+                amount_sp=row.get("osszeg_sp") or 0.0,
+                currency_sp=row.get("sp_penznem", ""),
+                amount_huf=amount_huf,
+            )
+        )
+    return customers
+
+
+def write_vevok_csv(customers, output_path):
+    with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(VEVOK_CSV_HEADERS)
+        writer.writerows(
+            [
+                customer.name,
+                format_hu(customer.amount_bp),
+                customer.currency_bp,
+                format_hu(customer.amount_sp),
+                customer.currency_sp,
+                format_hu(customer.amount_huf),
+            ]
+            for customer in customers
+        )
+    return output_path
 
 
-def process_cofanet_files(
-    sap_path,
+def _fill_and_remember(
     coface_excel_path,
-    eur_rate,
+    customers,
+    summary_rows,
     save_path,
+    sap_hash,
+    coface_hash,
     progress_callback=None,
     is_cancelled=None,
+    use_match_cache=True,
 ):
+    match_cache = MatchCache(MATCH_CACHE_PATH) if use_match_cache else None
+    matched_cells = []
     try:
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-        if progress_callback:
-            progress_callback("SAP adatok olvasása...", 0, 0)
-        summary_rows = extract_invoice_summary(
-            sap_path,
-            progress_callback=progress_callback,
-            is_cancelled=is_cancelled,
-        )
-        _raise_if_cancelled(is_cancelled)
-
-        summary_rows_sorted = sorted(summary_rows, key=lambda x: x["cegnev"].lower())
-        output_path = os.path.join(OUTPUT_DIR, "vevok.csv")
-        headers = [
-            "Vevő",
-            "Összeg BP-ben",
-            "BP pénznem",
-            "Összeg SP-ben",
-            "SP pénznem",
-            "Forintosítva HUF",
-        ]
-
-        total_rows = len(summary_rows_sorted)
-        with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(headers)
-            for index, row in enumerate(summary_rows_sorted, start=1):
-                _raise_if_cancelled(is_cancelled)
-                if progress_callback:
-                    progress_callback("Vevők CSV mentése...", index, total_rows)
-
-                osszeg_bp = row.get("osszeg_bp", "").replace(".", "").replace(",", ".")
-                bp_penznem = row.get("bp_penznem", "").upper()
-                try:
-                    osszeg_bp_float = float(osszeg_bp) if osszeg_bp else 0.0
-                except Exception:
-                    osszeg_bp_float = 0.0
-
-                if bp_penznem != "HUF":
-                    forintositva_str = _format_hu_amount(osszeg_bp_float * eur_rate)
-                else:
-                    forintositva_str = row.get("osszeg_bp", "")
-
-                writer.writerow(
-                    [
-                        row.get("cegnev", ""),
-                        row.get("osszeg_bp", ""),
-                        row.get("bp_penznem", ""),
-                        row.get("osszeg_sp", ""),
-                        row.get("sp_penznem", ""),
-                        forintositva_str,
-                    ]
-                )
-
-        _raise_if_cancelled(is_cancelled)
-        coface_output_path = fill_coface_excel_and_open(
+        coface_output_path = fill_coface_excel(
             coface_excel_path,
-            output_path,
+            [(customer.name.strip(), customer.amount_huf) for customer in customers],
             save_path=save_path,
             progress_callback=progress_callback,
             is_cancelled=is_cancelled,
-            open_file=False,
+            match_cache=match_cache,
+            matched_cells=matched_cells,
         )
+    finally:
+        if match_cache is not None:
+            match_cache.close()
+    save_run_state(RUN_STATE_PATH, sap_hash, coface_hash, summary_rows, matched_cells)
+    return coface_output_path
 
-        return {
-            "cancelled": False,
-            "rows_count": total_rows,
-            "vevok_csv_path": output_path,
-            "coface_output_path": coface_output_path,
-        }
+
+def process_cofanet_files(
+    sap_path,
+    coface_excel_path,
+    eur_rate,
+    save_path,
+    progress_callback=None,
+    is_cancelled=None,
+    write_csv=True,
+    use_match_cache=True,
+    reuse_last_run=True,
+):
+    progress_callback = ProgressReporter.wrap(progress_callback)
+    workspace = JobWorkspace("cofanet")
+    try:
+        with Tracer("cofanet", source=os.path.basename(sap_path)) as tracer:
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+            with tracer.span("bemenet_hash"):
+                sap_hash = file_sha256(sap_path)
+                coface_hash = file_sha256(coface_excel_path)
+            last_run = (
+                load_run_state(RUN_STATE_PATH, sap_hash, coface_hash)
+                if reuse_last_run
+                else None
+            )
+
+            if last_run is not None:
+                # Változatlan bemenetek: csak a "Forintosítva HUF" oszlop számolódik újra
+                summary_rows = last_run["summary_rows"]
+            else:
+                if progress_callback:
+                    progress_callback("SAP adatok olvasása...", 0, 0)
+                with tracer.span("sap_olvasas") as span:
+                    summary_rows = summarize_invoices(
+                        sap_path,
+                        progress_callback=progress_callback,
+                        is_cancelled=is_cancelled,
+                    )
+                    span.rows = len(summary_rows)
+            _raise_if_cancelled(is_cancelled)
+
+            if progress_callback:
+                progress_callback("Vevők összeállítása...", 0, 0)
+            with tracer.span("vevok_osszeallitasa") as span:
+                customers = build_customer_amounts(
+                    summary_rows, eur_rate, is_cancelled=is_cancelled
+                )
+                span.rows = len(customers)
+            total_rows = len(customers)
+
+            # A vevok.csv csak mellékkimenet: a Coface Excel kitöltésével
+            # párhuzamosan íródik, az Excel közvetlenül a memóriából kapja az adatokat.
+            with (
+                tracer.span("coface_excel", rows=total_rows),
+                ThreadPoolExecutor(max_workers=1) as executor,
+            ):
+                csv_future = None
+                if write_csv:
+                    csv_future = executor.submit(
+                        write_vevok_csv,
+                        customers,
+                        workspace.path("vevok.csv"),
+                    )
+                if last_run is not None:
+                    apply_coface_amounts(
+                        coface_excel_path,
+                        [
+                            (coordinate, customers[idx].amount_huf)
+                            for idx, coordinate in last_run["matched_cells"]
+                        ],
+                        save_path=workspace.path("coface_output.xlsx"),
+                        progress_callback=progress_callback,
+                        is_cancelled=is_cancelled,
+                    )
+                else:
+                    _fill_and_remember(
+                        coface_excel_path,
+                        customers,
+                        summary_rows,
+                        workspace.path("coface_output.xlsx"),
+                        sap_hash,
+                        coface_hash,
+                        progress_callback=progress_callback,
+                        is_cancelled=is_cancelled,
+                        use_match_cache=use_match_cache,
+                    )
+                if csv_future is not None:
+                    csv_future.result()
+
+            # A kész fájlok csak a sikeres futás végén kerülnek a helyükre
+            output_path = workspace.publish("vevok.csv") if write_csv else None
+            coface_output_path = workspace.publish(
+                "coface_output.xlsx", save_path or default_output_path(coface_excel_path)
+            )
+            return {
+                "cancelled": False,
+                "rows_count": total_rows,
+                "vevok_csv_path": output_path,
+                "coface_output_path": coface_output_path,
+                "reused_last_run": last_run is not None,
+                "stats": tracer.stats(),
+            }
     except InterruptedError:
         return {
             "cancelled": True,
             "rows_count": 0,
             "vevok_csv_path": None,
             "coface_output_path": None,
+            "stats": tracer.stats(),
         }
+    finally:
+        workspace.cleanup()
@@ -1,11 +1,12 @@
 import csv
-import shutil
-from pathlib import Path
+import os
 
 import pandas as pd
 import xlsxwriter
 
-from app.config.paths import module_output_dir
+from app.backend.services.perf_service import Tracer
+from app.backend.services.workspace_service import JobWorkspace
+from app.backend.workers.progress import ProgressReporter
 
 
 class Processor:
@@ -17,16 +18,28 @@ class Processor:
         progress_callback=None,
         is_cancelled=None,
     ):
+        progress_callback = ProgressReporter.wrap(progress_callback)
+        workspace = JobWorkspace("ksh")
         try:
-            return self._process(
-                ksh_path,
-                matstamm_path,
-                save_path=save_path,
-                progress_callback=progress_callback,
-                is_cancelled=is_cancelled,
-            )
+            with Tracer("ksh", source=os.path.basename(ksh_path)) as tracer:
+                return self._process(
+                    ksh_path,
+                    matstamm_path,
+                    workspace,
+                    tracer,
+                    save_path=save_path,
+                    progress_callback=progress_callback,
+                    is_cancelled=is_cancelled,
+                )
         except InterruptedError:
-            return {"cancelled": True, "output_path": None, "row_count": 0}
+            return {
+                "cancelled": True,
+                "output_path": None,
+                "row_count": 0,
+                "stats": tracer.stats(),
+            }
+        finally:
+            workspace.cleanup()
 
     def _raise_if_cancelled(self, is_cancelled=None):
         if is_cancelled and is_cancelled():
@@ -36,20 +49,24 @@ class Processor:
         self,
         ksh_path: str,
         matstamm_path: str,
+        workspace: JobWorkspace,
+        tracer: Tracer,
         save_path: str | None = None,
         progress_callback=None,
         is_cancelled=None,
     ):
-        output_dir = module_output_dir("ksh")
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_csv_path = output_dir / "data.csv"
-        output_xlsx_path = output_dir / "data.xlsx"
+        output_csv_path = workspace.path("data.csv")
+        output_xlsx_path = workspace.path("data.xlsx")
 
         if progress_callback:
             progress_callback("KSH fájl beolvasása...", 0, 0)
-        with open(ksh_path, "r", encoding="utf-16le", newline="") as f:
+        with (
+            tracer.span("ksh_olvasas") as span,
+            open(ksh_path, "r", encoding="utf-16le", newline="") as f,
+        ):
             reader = csv.reader(f, delimiter="\t")
             rows = [row for row in reader]
+            span.rows = len(rows)
 
         self._raise_if_cancelled(is_cancelled)
         rows_to_delete = {0, 1, 2, 4, 5}
@@ -66,15 +83,17 @@ class Processor:
             progress_callback("Matstamm beolvasása (Pandas + Calamine motorral)...", 0, 0)
         
         # PANDAS + CALAMINE OPTIMALIZÁCIÓ
-        try:
-            df_mat = pd.read_excel(
-                matstamm_path,
-                engine="calamine",
-                usecols=lambda x: str(x).strip() in ["Anyag", "Beszerzés fajtája"],
-                dtype=str,
-            )
-        except Exception as e:
-            raise ValueError(f"Hiba a Matstamm fájl beolvasásakor: {e}")
+        with tracer.span("matstamm_olvasas") as span:
+            try:
+                df_mat = pd.read_excel(
+                    matstamm_path,
+                    engine="calamine",
+                    usecols=lambda x: str(x).strip() in ["Anyag", "Beszerzés fajtája"],
+                    dtype=str,
+                )
+            except Exception as e:
+                raise ValueError(f"Hiba a Matstamm fájl beolvasásakor: {e}")
+            span.rows = len(df_mat)
 
         anyag_col = next((c for c in df_mat.columns if str(c).strip() == "Anyag"), None)
         besz_col = next((c for c in df_mat.columns if str(c).strip() == "Beszerzés fajtája"), None)
@@ -105,10 +124,10 @@ class Processor:
 
         new_data_rows = []
         total_data_rows = len(data_rows)
+        rows_span = tracer.start_span("sorok_kiegeszitese", rows=total_data_rows)
         for index, row in enumerate(data_rows, start=1):
             self._raise_if_cancelled(is_cancelled)
-            # Ne floodoljuk a GUI-t másodpercenként 1000 eventtel, csak 10000 soronként szóljunk
-            if progress_callback and index % 10000 == 0:
+            if progress_callback:
                 progress_callback("KSH sorok kiegészítése...", index, total_data_rows)
             if len(row) > expected_original_len:
                 row = row[:expected_original_len]
@@ -119,6 +138,7 @@ class Processor:
             new_row = row.copy()
             new_row.append(iparagi_ertekesites)
             new_data_rows.append(new_row)
+        tracer.end_span(rows_span)
 
         def to_clean_float(cell):
             if not cell or str(cell).strip() == "":
@@ -177,9 +197,10 @@ class Processor:
 
         egysites_data_rows = []
         total_rows = len(new_data_rows)
+        balance_span = tracer.start_span("egyenleg_szamitas", rows=total_rows)
         for index, row in enumerate(new_data_rows, start=1):
             self._raise_if_cancelled(is_cancelled)
-            if progress_callback and index % 10000 == 0:
+            if progress_callback:
                 progress_callback("Egyenleg számítása...", index, total_rows)
             while len(row) < len(new_header):
                 row.append("")
@@ -197,21 +218,24 @@ class Processor:
                 + row[egyenleg_value_idx:]
             )
             egysites_data_rows.append(new_row)
+        tracer.end_span(balance_span)
 
         if progress_callback:
             progress_callback("CSV mentése...", 0, 0)
-        with open(output_csv_path, "w", encoding="utf-8", newline="") as f:
+        with (
+            tracer.span("csv_iras", rows=total_rows),
+            open(output_csv_path, "w", encoding="utf-8", newline="") as f,
+        ):
             writer = csv.writer(f, delimiter=";")
             writer.writerow(egysites_header)
             writer.writerows(egysites_data_rows)
 
-        final_output_path = Path(save_path) if save_path else output_xlsx_path
-
         if progress_callback:
             progress_callback("XLSX írása (xlsxwriter)...", 0, 0)
 
+        xlsx_span = tracer.start_span("xlsx_iras", rows=total_rows)
         # XLSXWRITER OPTIMALIZÁCIÓ
-        wb = xlsxwriter.Workbook(final_output_path)
+        wb = xlsxwriter.Workbook(output_xlsx_path)
         ws = wb.add_worksheet("Adatok")
 
         # Stílusok
@@ -245,7 +269,7 @@ class Processor:
         # Adatok írása
         for row_num, row_data in enumerate(egysites_data_rows, start=1):
             self._raise_if_cancelled(is_cancelled)
-            if progress_callback and row_num % 10000 == 0:
+            if progress_callback:
                 progress_callback("Excel sorok írása...", row_num, total_rows)
             for col_num, cell_data in enumerate(row_data):
                 val_to_write = cell_data
@@ -278,18 +302,22 @@ class Processor:
             ws.set_column(col_num, col_num, width + 2)
 
         wb.close()
+        tracer.end_span(xlsx_span)
 
+        # Kész fájlok áthelyezése a munkamappából; a köztes CSV mentési
+        # útvonal megadásakor a munkamappával együtt törlődik
         cleanup_message = ""
         if save_path:
-            try:
-                shutil.rmtree(output_dir)
-                cleanup_message = "Az output mappa törlésre került."
-            except Exception as exc:
-                cleanup_message = f"Figyelem, az output mappa törlése sikertelen: {exc}"
+            final_output_path = workspace.publish("data.xlsx", save_path)
+            cleanup_message = "Az ideiglenes munkamappa törlésre került."
+        else:
+            workspace.publish("data.csv")
+            final_output_path = workspace.publish("data.xlsx")
 
         return {
             "cancelled": False,
-            "output_path": str(final_output_path),
+            "output_path": final_output_path,
             "row_count": total_rows,
             "cleanup_message": cleanup_message,
+            "stats": tracer.stats(),
         }
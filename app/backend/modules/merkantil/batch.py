@@ -0,0 +1,247 @@
+import csv
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from app.backend.modules.merkantil.service import (
+    MAX_PDF_WORKERS,
+    OUTPUT_HEADER,
+    OperationCancelled,
+    _raise_if_cancelled,
+    cancellable_process_pool,
+    extract_vehicles,
+    kgthely_rows,
+    read_kgthely_mapping,
+    save_to_csv_with_kgthely,
+    worker_cancelled,
+)
+from app.backend.services.file_service import file_sha256
+from app.backend.services.perf_service import Tracer
+from app.backend.services.workspace_service import JobWorkspace
+from app.backend.workers.progress import ProgressReporter
+
+
+BATCH_PREVIEW_HEADER = ["PDF", "Autók", "Idő (mp)"]
+
+
+def collect_pdf_paths(source):
+    """Egy mappa PDF fájljai (ábécérendben) vagy a megadott fájllista."""
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name)
+            for name in os.listdir(source)
+            if name.lower().endswith(".pdf")
+            and os.path.isfile(os.path.join(source, name))
+        )
+    if isinstance(source, (str, os.PathLike)):
+        return [os.fspath(source)]
+    return [os.fspath(path) for path in source]
+
+
+def _process_batch_file(index, pdf_path, read_data_path, options):
+    # Worker processzben fut: ugyanaz a kinyerés, mint a run()-ban (tárolt
+    # sorok, backend, korai leállás), a szülő Event-jével megszakíthatóan
+    started = time.perf_counter()
+    with Tracer("merkantil", source=os.path.basename(pdf_path), batch=True) as tracer:
+        with tracer.span("pdf_hash"):
+            pdf_hash = file_sha256(pdf_path)
+        vehicles = extract_vehicles(
+            pdf_path,
+            pdf_hash,
+            read_data_path,
+            tracer,
+            is_cancelled=worker_cancelled,
+            workers=1,
+            **options,
+        )
+    return index, vehicles, time.perf_counter() - started, tracer.stats()
+
+
+def _output_stem(pdf_path):
+    return os.path.splitext(os.path.basename(pdf_path))[0]
+
+
+def _output_stems(pdf_paths):
+    """
+    PDF-enként egyedi kimeneti névtő: azonos nevű PDF-ek (pl. különböző
+    mappákból) sorszámot kapnak, hogy ne írják felül egymás CSV-jét.
+    """
+    stems = [_output_stem(pdf_path) for pdf_path in pdf_paths]
+    counts = Counter(stems)
+    used = set()
+    unique = []
+    for index, stem in enumerate(stems, start=1):
+        candidate = stem if counts[stem] == 1 else f"{stem}_{index}"
+        while candidate in used:
+            candidate = f"{candidate}_{index}"
+        used.add(candidate)
+        unique.append(candidate)
+    return unique
+
+
+def run_batch(
+    source,
+    excel_path,
+    consolidated=True,
+    output_dir=None,
+    workers=None,
+    progress_callback=None,
+    is_cancelled=None,
+    partial_callback=None,
+    use_line_store=True,
+    backend=None,
+    early_stop_pages=None,
+    remember_page_range=False,
+):
+    """
+    Több Merkantil PDF párhuzamos feldolgozása egy közös ktghely Excellel.
+
+    A source egy mappa vagy PDF útvonalak listája. consolidated=True esetén
+    egy közös CSV készül "Forrás fájl" oszloppal, különben PDF-enként egy.
+    Az eredmény fájlonként tartalmazza az autók számát és a futási időt.
+    Az output_dir nélküli futás saját output/merkantil/<futás> mappába ír.
+    A partial_callback minden elkészült PDF-ről kap egy összesítő sort.
+    A use_line_store, backend, early_stop_pages és remember_page_range
+    jelentése a run-nál; PDF-enként ugyanúgy érvényesülnek.
+    """
+    pdf_paths = collect_pdf_paths(source)
+    if not pdf_paths:
+        raise ValueError("Nem található feldolgozható PDF fájl.")
+    with JobWorkspace("merkantil") as workspace:
+        result = _run_batch(
+            pdf_paths,
+            excel_path,
+            workspace,
+            consolidated=consolidated,
+            workers=workers,
+            progress_callback=progress_callback,
+            is_cancelled=is_cancelled,
+            partial_callback=partial_callback,
+            options={
+                "use_line_store": use_line_store,
+                "backend": backend,
+                "early_stop_pages": early_stop_pages,
+                "remember_page_range": remember_page_range,
+            },
+        )
+        if result["cancelled"]:
+            return result
+        target_dir = output_dir or workspace.publish_dir
+        published = {
+            workspace.path(name): workspace.publish(name, os.path.join(target_dir, name))
+            for name in sorted(os.listdir(workspace.root))
+        }
+    for entry in result["files"]:
+        entry["output_csv"] = published[entry["output_csv"]]
+    result["output_csvs"] = [published[path] for path in result["output_csvs"]]
+    if output_dir is None:
+        result["output_dir"] = str(workspace.publish_dir)
+    return result
+
+
+def _run_batch(
+    pdf_paths,
+    excel_path,
+    workspace,
+    consolidated=True,
+    workers=None,
+    progress_callback=None,
+    is_cancelled=None,
+    partial_callback=None,
+    options=None,
+):
+    progress_callback = ProgressReporter.wrap(progress_callback)
+    started = time.perf_counter()
+    output_dir = str(workspace.root)
+
+    if progress_callback:
+        progress_callback("Excel beolvasása...", 0, 0)
+    kgthely = read_kgthely_mapping(excel_path)
+
+    if workers is None:
+        workers = min(len(pdf_paths), os.cpu_count() or 1, MAX_PDF_WORKERS)
+    total = len(pdf_paths)
+    stems = _output_stems(pdf_paths)
+    results = {}
+    executor, cancel_event = cancellable_process_pool(max(1, workers))
+    try:
+        pending = {
+            executor.submit(
+                _process_batch_file,
+                index,
+                pdf_path,
+                os.path.join(output_dir, f"read_data_{stems[index]}.csv"),
+                options or {},
+            )
+            for index, pdf_path in enumerate(pdf_paths)
+        }
+        if progress_callback:
+            progress_callback("PDF-ek feldolgozása...", 0, total)
+        while pending:
+            _raise_if_cancelled(is_cancelled)
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, vehicles, seconds, stats = future.result()
+                results[index] = (vehicles, seconds, stats)
+                if partial_callback:
+                    partial_callback(
+                        BATCH_PREVIEW_HEADER,
+                        [[os.path.basename(pdf_paths[index]), len(vehicles), round(seconds, 1)]],
+                    )
+                if progress_callback:
+                    progress_callback("PDF-ek feldolgozása...", len(results), total)
+    except OperationCancelled:
+        return {"cancelled": True, "output_csvs": [], "vehicle_count": 0, "files": []}
+    finally:
+        # A futó workerek is oldalanként figyelik az Event-et és leállnak
+        cancel_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if progress_callback:
+        progress_callback("CSV mentése...", 0, 0)
+    files = []
+    output_csvs = []
+    if consolidated:
+        output_csv = os.path.join(output_dir, "output_batch.csv")
+        with open(output_csv, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Forrás fájl"] + OUTPUT_HEADER)
+            for index, pdf_path in enumerate(pdf_paths):
+                source_name = os.path.basename(pdf_path)
+                for vehicle, cats in results[index][0]:
+                    writer.writerows(
+                        [source_name] + row
+                        for row in kgthely_rows(vehicle, cats, kgthely, round_amounts="Yes")
+                    )
+        output_csvs.append(output_csv)
+
+    for index, pdf_path in enumerate(pdf_paths):
+        vehicles, seconds, stats = results[index]
+        file_csv = None
+        if not consolidated:
+            file_csv = os.path.join(output_dir, f"{stems[index]}_output.csv")
+            save_to_csv_with_kgthely(
+                vehicles,
+                output_path=file_csv,
+                kgthely_dict=kgthely,
+                round_amounts="Yes",
+            )
+            output_csvs.append(file_csv)
+        files.append(
+            {
+                "pdf_path": pdf_path,
+                "vehicle_count": len(vehicles),
+                "seconds": round(seconds, 3),
+                "output_csv": file_csv or output_csvs[0],
+                "stats": stats,
+            }
+        )
+
+    return {
+        "cancelled": False,
+        "output_csvs": output_csvs,
+        "vehicle_count": sum(f["vehicle_count"] for f in files),
+        "files": files,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
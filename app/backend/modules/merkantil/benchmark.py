@@ -0,0 +1,96 @@
+"""
+PDF szövegkinyerő backendek összehasonlítása Merkantil kimutatásokon.
+
+Használat:
+    python -m app.backend.modules.merkantil.benchmark pdf [pdf ...] [--backend NÉV]
+
+Legalább egy PDF fájl vagy PDF-eket tartalmazó mappa megadandó. Minden
+telepített (vagy a --backend opcióval kiválasztott) backendre kiírja az oldal/mp értéket, és hogy a kinyert
+szövegből a jármű regex ugyanazokat az autókat találja-e, mint az
+alapértelmezett backend.
+"""
+
+import argparse
+import sys
+import time
+
+from app.backend.modules.merkantil.batch import collect_pdf_paths
+from app.backend.modules.merkantil.pdf_backends import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    available_backends,
+)
+from app.backend.modules.merkantil.service import iter_pdf_pages, iter_vehicle_blocks
+
+
+def benchmark_backend(backend_name, pdf_path, start_page=2):
+    pages = []
+    started = time.perf_counter()
+    for text in iter_pdf_pages(pdf_path, start_page=start_page, backend=backend_name):
+        pages.append(text)
+    seconds = time.perf_counter() - started
+    vehicles = [name for name, _ in iter_vehicle_blocks(pages)]
+    return {
+        "backend": backend_name,
+        "pages": len(pages),
+        "seconds": seconds,
+        "pages_per_sec": len(pages) / seconds if seconds > 0 else 0.0,
+        "vehicles": vehicles,
+    }
+
+
+def run_benchmark(pdf_paths, backends=None, start_page=2):
+    backends = backends or available_backends()
+    if DEFAULT_BACKEND in backends:
+        backends = [DEFAULT_BACKEND] + [b for b in backends if b != DEFAULT_BACKEND]
+    results = []
+    for pdf_path in pdf_paths:
+        reference = None
+        for backend_name in backends:
+            result = benchmark_backend(backend_name, pdf_path, start_page=start_page)
+            result["pdf_path"] = pdf_path
+            if reference is None:
+                reference = result["vehicles"]
+            result["equivalent"] = result["vehicles"] == reference
+            results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF backendek sebesség-összehasonlítása")
+    parser.add_argument("pdfs", nargs="+", help="PDF fájlok vagy mappák")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=sorted(BACKENDS),
+        help="Csak a megadott backend(ek)",
+    )
+    parser.add_argument("--start-page", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    installed = available_backends()
+    missing = [name for name in args.backend or [] if name not in installed]
+    if missing:
+        parser.error(f"nincs telepítve: {', '.join(missing)}")
+
+    pdf_paths = []
+    for source in args.pdfs:
+        pdf_paths.extend(collect_pdf_paths(source))
+    if not pdf_paths:
+        print("Nem található PDF fájl.", file=sys.stderr)
+        return 1
+
+    results = run_benchmark(pdf_paths, backends=args.backend, start_page=args.start_page)
+    print(f"{'PDF':<40} {'backend':<10} {'oldal':>6} {'mp':>8} {'oldal/mp':>9} {'autó':>6}  egyezik")
+    for r in results:
+        name = r["pdf_path"][-40:]
+        print(
+            f"{name:<40} {r['backend']:<10} {r['pages']:>6} {r['seconds']:>8.2f} "
+            f"{r['pages_per_sec']:>9.1f} {len(r['vehicles']):>6}  "
+            f"{'igen' if r['equivalent'] else 'NEM'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import json
+import os
+import re
+
+from app.config.paths import project_path
+
+DEFAULT_CATEGORIES = {
+    "Bérleti díj": [
+        "Cégautóadó",
+        "Gépjárműadó",
+        "Finanszírozási díj",
+        "Gépjármű kezelési díj",
+        "Assistance szolgáltatás",
+    ],
+    "Biztosítás": ["Casco biztosítás", "GAP biztosítás", "Kötelező biztosítás"],
+    "Autókarbantartás": ["Abroncs szolgáltatás", "Szervizdíj  havi fix része"],
+}
+
+# Ha létezik, felülírja az alapértelmezett kategória táblát:
+# {"Kategória": ["kulcsszó", ...], ...}
+CATEGORY_CONFIG_PATH = str(project_path("config", "merkantil_categories.json"))
+
+AMOUNT_PATTERN = re.compile(r"(\d[\d\s\xa0\u202f]*\d)\s*HUF")
+
+
+def load_categories(config_path=None):
+    path = config_path or CATEGORY_CONFIG_PATH
+    if not os.path.exists(path):
+        return {category: list(keywords) for category, keywords in DEFAULT_CATEGORIES.items()}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not all(
+        isinstance(keywords, list) for keywords in data.values()
+    ):
+        raise ValueError(f"Érvénytelen kategória konfiguráció: {path}")
+    return {str(category): [str(k) for k in keywords] for category, keywords in data.items()}
+
+
+def parse_amount(line):
+    last = None
+    for last in AMOUNT_PATTERN.finditer(line):
+        pass
+    if last is None:
+        return 0.0
+    number = "".join(filter(str.isdigit, last.group(1)))
+    return float(number[2:]) if len(number) > 2 else 0.0
+
+
+class CategoryMatcher:
+    """
+    Egyetlen előre fordított regex az összes kategória kulcsszavára.
+
+    Ugyanazt adja, mint a kategóriák sorrendjében végzett
+    "any(keyword in line)" keresés: több találat esetén a táblában
+    előbb szereplő kategória nyer.
+    """
+
+    def __init__(self, categories):
+        self.names = list(categories)
+        keyword_rank = {}
+        for rank, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                if keyword:
+                    keyword_rank.setdefault(keyword, rank)
+        # Egy talált kulcsszóban benne lévő rövidebb kulcsszavak is
+        # illeszkednek, ezért a rangja ezek minimuma.
+        self._rank = {
+            keyword: min(r for other, r in keyword_rank.items() if other in keyword)
+            for keyword in keyword_rank
+        }
+        if keyword_rank:
+            alternation = "|".join(
+                re.escape(k) for k in sorted(keyword_rank, key=len, reverse=True)
+            )
+            self._any = re.compile(alternation)
+            self._all = re.compile(f"(?=({alternation}))")
+        else:
+            self._any = self._all = None
+
+    def matches_any(self, text):
+        """Van-e a szövegben bármelyik kategória kulcsszava."""
+        return self._any is not None and self._any.search(text) is not None
+
+    def categorize(self, line):
+        if self._any is None or self._any.search(line) is None:
+            return None
+        rank = min(self._rank[m.group(1)] for m in self._all.finditer(line))
+        return self.names[rank]
+
+    def classify(self, line):
+        """(kategória, összeg) pár; kategória nélküli sornál (None, "")."""
+        category = self.categorize(line)
+        if category is None:
+            return None, ""
+        return category, parse_amount(line)
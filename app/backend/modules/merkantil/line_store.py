@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from app.backend.services.file_service import atomic_write
+
+MAX_STORES = 50
+
+
+def categories_fingerprint(categories):
+    payload = json.dumps(categories, ensure_ascii=False, sort_keys=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class LineStoreBuilder:
+    """
+    A kategorizált sorokat oszloposan gyűjti: autó index, kategória kód,
+    összeg. A kategória nélküli sorok nem kerülnek bele.
+    """
+
+    def __init__(self, categories):
+        self.category_names = list(categories)
+        self._category_codes = {name: code for code, name in enumerate(self.category_names)}
+        self.vehicle_names = []
+        self._vehicle_ids = []
+        self._codes = []
+        self._amounts = []
+
+    def add_vehicle(self, vehicle_name, lines):
+        vehicle_id = len(self.vehicle_names)
+        self.vehicle_names.append(vehicle_name)
+        for _, _, category, amount in lines:
+            if category and isinstance(amount, (int, float)):
+                self._vehicle_ids.append(vehicle_id)
+                self._codes.append(self._category_codes[category])
+                self._amounts.append(amount)
+
+    def build(self):
+        return LineStore(
+            self.vehicle_names,
+            self.category_names,
+            np.asarray(self._vehicle_ids, dtype=np.int32),
+            np.asarray(self._codes, dtype=np.int16),
+            np.asarray(self._amounts, dtype=np.float64),
+        )
+
+
+class LineStore:
+    def __init__(self, vehicle_names, category_names, vehicle_ids, codes, amounts):
+        self.vehicle_names = list(vehicle_names)
+        self.category_names = list(category_names)
+        self.vehicle_ids = vehicle_ids
+        self.codes = codes
+        self.amounts = amounts
+
+    def summarize(self, multiplier=1.27):
+        """
+        Ugyanazt adja, mint a process_vehicles: [(autó, {kategória: összeg})],
+        de a tárolt sorokból, vektorizált csoportosítással.
+        """
+        shape = (len(self.vehicle_names), len(self.category_names))
+        sums = np.zeros(shape, dtype=np.float64)
+        counts = np.zeros(shape, dtype=np.int32)
+        # np.add.at sorrendben halmoz, így az összegek megegyeznek a
+        # soronkénti Python összeadással
+        np.add.at(sums, (self.vehicle_ids, self.codes), self.amounts)
+        np.add.at(counts, (self.vehicle_ids, self.codes), 1)
+        scaled = sums * multiplier
+        results = []
+        for vehicle_id, vehicle_name in enumerate(self.vehicle_names):
+            present = np.flatnonzero(counts[vehicle_id])
+            results.append(
+                (
+                    vehicle_name,
+                    {
+                        self.category_names[code]: round(float(scaled[vehicle_id, code]), 2)
+                        for code in present
+                    },
+                )
+            )
+        return results
+
+    def save(self, path):
+        with atomic_write(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                vehicle_names=np.asarray(self.vehicle_names, dtype=str),
+                category_names=np.asarray(self.category_names, dtype=str),
+                vehicle_ids=self.vehicle_ids,
+                codes=self.codes,
+                amounts=self.amounts,
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["vehicle_names"].tolist(),
+                data["category_names"].tolist(),
+                data["vehicle_ids"],
+                data["codes"],
+                data["amounts"],
+            )
+
+
+def store_path(store_dir, pdf_hash, categories):
+    return os.path.join(
+        store_dir, f"lines_{pdf_hash[:40]}_{categories_fingerprint(categories)}.npz"
+    )
+
+
+def load_line_store(store_dir, pdf_hash, categories):
+    path = store_path(store_dir, pdf_hash, categories)
+    if not os.path.exists(path):
+        return None
+    try:
+        store = LineStore.load(path)
+    except Exception:
+        return None
+    os.utime(path)
+    return store
+
+
+def save_line_store(store_dir, pdf_hash, categories, store):
+    os.makedirs(store_dir, exist_ok=True)
+    store.save(store_path(store_dir, pdf_hash, categories))
+    stores = sorted(
+        (entry for entry in os.scandir(store_dir) if entry.name.startswith("lines_")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in stores[MAX_STORES:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
@@ -6,3 +6,4 @@ class MerkantilResult:
     cancelled: bool
     output_csv: str | None
     vehicle_count: int = 0
+
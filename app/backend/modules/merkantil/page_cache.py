@@ -0,0 +1,218 @@
+import hashlib
+import sqlite3
+import time
+
+from app.backend.modules.merkantil.page_range import resolve_last_index
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+# A page_fingerprint számítás változásakor emelendő: a régi bejegyzések törlődnek
+CACHE_VERSION = 2
+
+
+def _hash_resources(digest, resources, seen):
+    # Fontok (BaseFont + ToUnicode) és a Form XObject-ek tartalma,
+    # rekurzívan: azonos oldal content stream mellett ezek is más szöveget adhatnak
+    if resources is None:
+        return
+    resources = resources.get_object()
+    fonts = resources.get("/Font")
+    if fonts is not None:
+        for name, ref in sorted(fonts.get_object().items()):
+            font = ref.get_object()
+            digest.update(str(name).encode())
+            digest.update(str(font.get("/BaseFont", "")).encode())
+            to_unicode = font.get("/ToUnicode")
+            if to_unicode is not None:
+                digest.update(to_unicode.get_object().get_data())
+    xobjects = resources.get("/XObject")
+    if xobjects is not None:
+        for name, ref in sorted(xobjects.get_object().items()):
+            xobject = ref.get_object()
+            subtype = xobject.get("/Subtype")
+            digest.update(str(name).encode())
+            digest.update(str(subtype).encode())
+            # Képekből nem nyerődik szöveg, csak a Form tartalma számít
+            if subtype != "/Form" or id(xobject) in seen:
+                continue
+            seen.add(id(xobject))
+            digest.update(xobject.get_data())
+            _hash_resources(digest, xobject.get("/Resources"), seen)
+
+
+def page_fingerprint(page):
+    """
+    Egy PDF oldal tartalom-hash-e: a content stream, a forgatás, a fontok
+    (BaseFont + ToUnicode) és a Form XObject-ek (rekurzívan) alapján, mert
+    ezek határozzák meg a kinyert szöveget.
+    """
+    digest = hashlib.sha256()
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    digest.update(str(page.get("/Rotate", 0)).encode())
+    _hash_resources(digest, page.get("/Resources"), set())
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    """
+    Oldalankénti kinyert szöveg cache (SQLite), méretkorláttal és LRU
+    kiürítéssel.
+
+    A szövegek az oldal tartalom-hash-e szerint tárolódnak, így egy
+    részben módosított PDF-nél csak a megváltozott oldalakat kell újra
+    kinyerni. A teljes fájl hash-éhez tartozó oldal-lista alapján egy
+    változatlan PDF a PDF megnyitása nélkül betölthető.
+    """
+
+    def __init__(self, db_path, max_bytes=DEFAULT_MAX_BYTES, timeout=30.0):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        # Több processz (batch mód) is írhatja egyszerre, ezért hosszabb várakozás
+        self._conn = sqlite3.connect(self.db_path, timeout=timeout)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS page_text (
+                page_key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS page_text_last_used ON page_text (last_used);
+            CREATE TABLE IF NOT EXISTS document_pages (
+                pdf_hash TEXT NOT NULL,
+                page_index INTEGER NOT NULL,
+                page_key TEXT NOT NULL,
+                PRIMARY KEY (pdf_hash, page_index)
+            );
+            CREATE TABLE IF NOT EXISTS documents (
+                pdf_hash TEXT PRIMARY KEY,
+                page_count INTEGER NOT NULL
+            );
+            """
+        )
+        # Régebbi (pl. XObject nélküli) hash-sel készült bejegyzések törlése
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            self._conn.executescript(
+                """
+                DELETE FROM page_text;
+                DELETE FROM document_pages;
+                DELETE FROM documents;
+                """
+            )
+            self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self._conn.commit()
+
+    def get_document(self, pdf_hash, first=0, end_page=None, skip_last_pages=0):
+        """
+        A first indextől az utolsó oldalig (end_page / skip_last_pages
+        megadásakor a tartomány végéig) tartó szövegeket adja vissza, ha
+        mind a cache-ben van, különben None-t.
+        """
+        row = self._conn.execute(
+            "SELECT page_count FROM documents WHERE pdf_hash = ?", (pdf_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        last = resolve_last_index(row[0], first, end_page, skip_last_pages)
+        if first >= last:
+            return []
+        rows = self._conn.execute(
+            """
+            SELECT d.page_index, d.page_key, t.text
+            FROM document_pages d JOIN page_text t ON t.page_key = d.page_key
+            WHERE d.pdf_hash = ? AND d.page_index >= ? AND d.page_index < ?
+            ORDER BY d.page_index
+            """,
+            (pdf_hash, first, last),
+        ).fetchall()
+        if [r[0] for r in rows] != list(range(first, last)):
+            return None
+        self._touch(r[1] for r in rows)
+        return [r[2] for r in rows]
+
+    def get_pages(self, page_keys):
+        """
+        A page_keys (oldalindex -> tartalom-hash) alapján a cache-ben
+        megtalált oldalak szövegét adja vissza {oldalindex: szöveg} formában.
+        """
+        found = {}
+        keys = list(set(page_keys.values()))
+        texts = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            texts.update(
+                self._conn.execute(
+                    f"SELECT page_key, text FROM page_text WHERE page_key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            )
+        for index, key in page_keys.items():
+            if key in texts:
+                found[index] = texts[key]
+        self._touch(texts.keys())
+        return found
+
+    def put_document(self, pdf_hash, page_count, page_keys, texts):
+        """
+        Elmenti az új oldalszövegeket (texts: tartalom-hash -> szöveg) és a
+        dokumentum oldal-listáját (page_keys: oldalindex -> tartalom-hash).
+        A page_keys lehet részleges is (oldaltartomány, korai leállás): egy
+        adott hash-ű PDF oldalai nem változnak, így a korábban rögzített
+        oldalak megmaradnak.
+        """
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO page_text (page_key, text, size, last_used) VALUES (?, ?, ?, ?)",
+            [(key, text, len(text.encode("utf-8")), now) for key, text in texts.items()],
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO document_pages (pdf_hash, page_index, page_key) VALUES (?, ?, ?)",
+            [(pdf_hash, index, key) for index, key in page_keys.items()],
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO documents (pdf_hash, page_count) VALUES (?, ?)",
+            (pdf_hash, page_count),
+        )
+        self._evict()
+        self._conn.commit()
+
+    def _touch(self, page_keys):
+        now = time.time()
+        self._conn.executemany(
+            "UPDATE page_text SET last_used = ? WHERE page_key = ?",
+            [(now, key) for key in page_keys],
+        )
+        self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM page_text").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT page_key, size FROM page_text ORDER BY last_used"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM page_text WHERE page_key = ?", evicted)
+        # A kiürített oldalakra hivatkozó dokumentumok a get_document-ben
+        # hiányosnak látszanak, így újra a tartalom-hash alapú úton töltődnek.
+
+    def close(self):
+        try:
+            self._conn.commit()
+        finally:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,105 @@
+import hashlib
+import json
+
+from app.backend.services.file_service import atomic_write
+
+
+def resolve_last_index(page_count, first=0, end_page=None, skip_last_pages=0):
+    """Az utolsó feldolgozandó oldal utáni 0-alapú index."""
+    last = page_count if end_page is None else min(page_count, end_page)
+    return max(first, last - skip_last_pages)
+
+
+def pdf_layout(reader):
+    """
+    (elrendezés kulcs, oldalszám) pár. Az azonos generátorral és
+    oldalmérettel készült kimutatások kulcsa megegyezik.
+    """
+    metadata = getattr(reader, "metadata", None) or {}
+    producer = str(metadata.get("/Producer", ""))
+    creator = str(metadata.get("/Creator", ""))
+    page_count = len(reader.pages)
+    size = ""
+    if page_count:
+        box = reader.pages[0].mediabox
+        size = f"{float(box.width):.0f}x{float(box.height):.0f}"
+    key = hashlib.sha1(f"{producer}|{creator}|{size}".encode("utf-8")).hexdigest()
+    return key, page_count
+
+
+class PageRangeMemory:
+    """
+    Elrendezésenként megjegyzi, hány záró oldal (összesítő, jogi szöveg)
+    nem tartalmaz autót, hogy a következő futás ezeket ki se nyerje.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except Exception:
+            self._data = {}
+
+    def tail_pages(self, layout_key):
+        return int(self._data.get(layout_key, {}).get("tail_pages", 0))
+
+    def remember(self, layout_key, tail_pages):
+        self._data[layout_key] = {"tail_pages": int(tail_pages)}
+        self._save()
+
+    def forget(self, layout_key):
+        if self._data.pop(layout_key, None) is not None:
+            self._save()
+
+    def _save(self):
+        with atomic_write(self.path, encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+
+
+class VehiclePageTracker:
+    """
+    Oldalfolyam szűrő: ha már volt autó, és stop_after egymást követő
+    oldalon nincs autó tartalom, leállítja a folyamot (így a forrás
+    generátor a hátralévő kinyerést is megszakítja).
+    """
+
+    def __init__(self, is_vehicle_page, stop_after=None):
+        self.is_vehicle_page = is_vehicle_page
+        self.stop_after = stop_after
+        self.pages_seen = 0
+        self.last_vehicle_page = None
+        self.stopped_early = False
+        # A megjegyzett záró tartományban is volt autó (iter_tracked_pages)
+        self.range_exceeded = False
+
+    def tail_pages(self, page_count, start_page=2):
+        """
+        Az autó nélküli záró oldalak száma, ha a folyam a PDF végéig tartott;
+        korai leállás után (vagy autó nélkül) None, mert a ki nem olvasott
+        oldalakon is lehetett autó.
+        """
+        if self.stopped_early or self.last_vehicle_page is None:
+            return None
+        # start_page: a tracker 0. oldalának 1-alapú sorszáma a PDF-ben
+        return max(0, page_count - (self.last_vehicle_page + start_page))
+
+    def wrap(self, pages):
+        empty_run = 0
+        try:
+            for page in pages:
+                position = self.pages_seen
+                self.pages_seen += 1
+                if self.is_vehicle_page(page):
+                    self.last_vehicle_page = position
+                    empty_run = 0
+                elif self.last_vehicle_page is not None:
+                    empty_run += 1
+                yield page
+                if self.stop_after and empty_run >= self.stop_after:
+                    self.stopped_early = True
+                    return
+        finally:
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
@@ -0,0 +1,107 @@
+import importlib.util
+from abc import ABC, abstractmethod
+
+from app.config.settings import PDF_TEXT_BACKEND
+
+DEFAULT_BACKEND = PDF_TEXT_BACKEND
+
+
+class PdfDocument(ABC):
+    page_count = 0
+    # A pypdf-kompatibilis olvasó (ha van), a page cache oldal-hash-éhez
+    reader = None
+
+    @abstractmethod
+    def extract_page(self, index):
+        """Az index-edik oldal szövege."""
+
+    def close(self):
+        pass
+
+
+class PdfTextBackend(ABC):
+    """
+    PDF szövegkinyerő backend. Az open() egy PdfDocument-et ad, aminek
+    extract_page(index) metódusa egy oldal szövegét adja vissza.
+    """
+
+    name = ""
+    module = ""
+
+    def is_available(self):
+        return importlib.util.find_spec(self.module) is not None
+
+    @abstractmethod
+    def open(self, pdf_path):
+        """A pdf_path megnyitása; PdfDocument-et ad vissza."""
+
+
+class _ReaderDocument(PdfDocument):
+    def __init__(self, reader):
+        self.reader = reader
+        self.page_count = len(reader.pages)
+
+    def extract_page(self, index):
+        return self.reader.pages[index].extract_text() or ""
+
+
+class PyPDF2Backend(PdfTextBackend):
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def open(self, pdf_path):
+        from PyPDF2 import PdfReader
+
+        return _ReaderDocument(PdfReader(pdf_path))
+
+
+class PypdfBackend(PdfTextBackend):
+    name = "pypdf"
+    module = "pypdf"
+
+    def open(self, pdf_path):
+        from pypdf import PdfReader
+
+        return _ReaderDocument(PdfReader(pdf_path))
+
+
+class _PyMuPDFDocument(PdfDocument):
+    def __init__(self, document):
+        self._document = document
+        self.page_count = document.page_count
+
+    def extract_page(self, index):
+        return self._document[index].get_text() or ""
+
+    def close(self):
+        self._document.close()
+
+
+class PyMuPDFBackend(PdfTextBackend):
+    name = "pymupdf"
+    module = "fitz"
+
+    def open(self, pdf_path):
+        import fitz
+
+        return _PyMuPDFDocument(fitz.open(pdf_path))
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (PyPDF2Backend(), PypdfBackend(), PyMuPDFBackend())
+}
+
+
+def available_backends():
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def get_backend(name=None):
+    name = name or DEFAULT_BACKEND
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Ismeretlen PDF backend: {name}")
+    if not backend.is_available():
+        raise ValueError(f"A(z) '{name}' PDF backend nincs telepítve.")
+    return backend
@@ -1,29 +1,59 @@
 import csv
+import json
+import math
+import multiprocessing
 import os
 import re
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
-from app.config.paths import module_output_dir
+from app.backend.modules.merkantil.categories import (
+    CategoryMatcher,
+    load_categories,
+    parse_amount,
+)
+from app.backend.modules.merkantil.line_store import (
+    LineStoreBuilder,
+    load_line_store,
+    save_line_store,
+)
+from app.backend.modules.merkantil.page_cache import PageTextCache, page_fingerprint
+from app.backend.modules.merkantil.page_range import (
+    PageRangeMemory,
+    VehiclePageTracker,
+    pdf_layout,
+    resolve_last_index,
+)
+from app.backend.modules.merkantil.pdf_backends import PyPDF2Backend, get_backend
+from app.backend.services.file_service import atomic_write, file_sha256
+from app.backend.services.perf_service import Tracer
+from app.backend.services.workspace_service import JobWorkspace
+from app.backend.workers.progress import ProgressReporter
+from app.config.paths import module_cache_dir, module_output_dir
 
 import pandas as pd
 from PyPDF2 import PdfReader
 
-categories = {
-    "Bérleti díj": [
-        "Cégautóadó",
-        "Gépjárműadó",
-        "Finanszírozási díj",
-        "Gépjármű kezelési díj",
-        "Assistance szolgáltatás",
-    ],
-    "Biztosítás": ["Casco biztosítás", "GAP biztosítás", "Kötelező biztosítás"],
-    "Autókarbantartás": ["Abroncs szolgáltatás", "Szervizdíj  havi fix része"],
-}
+categories = load_categories()
+CATEGORY_MATCHER = CategoryMatcher(categories)
 
 OUTPUT_DIR = str(module_output_dir("merkantil"))
+PAGE_CACHE_PATH = str(module_cache_dir("merkantil") / "page_text.sqlite")
+KGTHELY_CACHE_PATH = str(module_cache_dir("merkantil") / "kgthely_mapping.json")
+LINE_STORE_DIR = str(module_cache_dir("merkantil") / "lines")
+PAGE_RANGE_PATH = str(module_cache_dir("merkantil") / "page_ranges.json")
 
+READ_DATA_HEADER = ["Autó", "Sor", "Kategória", "Összeg"]
 
-class OperationCancelled(Exception):
+# Az utolsó autó után ennyi autó nélküli oldal után leáll az olvasás
+EARLY_STOP_EMPTY_PAGES = 3
+
+# Ennyi oldal alatt nem éri meg worker processzeket indítani
+PARALLEL_MIN_PAGES = 40
+MAX_PDF_WORKERS = 8
+
+
+class OperationCancelled(InterruptedError):
     pass
 
 
@@ -32,94 +62,435 @@ def _raise_if_cancelled(is_cancelled=None):
         raise OperationCancelled()
 
 
+def default_pdf_workers(page_count):
+    if page_count < PARALLEL_MIN_PAGES:
+        return 1
+    return max(1, min(os.cpu_count() or 1, MAX_PDF_WORKERS))
+
+
+def _cache_key(backend, key):
+    # A PyPDF2 kulcsai előtag nélküliek, más backend szövege külön tárolódik
+    return key if backend.name == PyPDF2Backend.name else f"{backend.name}-{key}"
+
+
+# Worker processzben: a szülő megszakítás jelzése (cancellable_process_pool)
+_worker_cancel_event = None
+
+
+def _init_cancellable_worker(cancel_event):
+    global _worker_cancel_event
+    _worker_cancel_event = cancel_event
+
+
+def worker_cancelled():
+    """Worker processzben: kérte-e a szülő a megszakítást (is_cancelled)."""
+    return _worker_cancel_event is not None and _worker_cancel_event.is_set()
+
+
+def cancellable_process_pool(workers):
+    """
+    (ProcessPoolExecutor, Event) pár. A workerek oldalanként figyelik az
+    Event-et (worker_cancelled), így beállítása után a már futó feladatok
+    is egy oldalon belül leállnak, nem csak a még el nem kezdettek.
+    """
+    context = multiprocessing.get_context()
+    cancel_event = context.Event()
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_cancellable_worker,
+        initargs=(cancel_event,),
+    )
+    return executor, cancel_event
+
+
+def _extract_pages(pdf_path, indices, backend_name=None):
+    # Worker processzben fut: saját dokumentumot nyit. Megszakításkor az
+    # addig kinyert oldalakat adja vissza.
+    document = get_backend(backend_name).open(pdf_path)
+    try:
+        texts = []
+        for index in indices:
+            if worker_cancelled():
+                break
+            texts.append(document.extract_page(index))
+        return indices[: len(texts)], texts
+    finally:
+        document.close()
+
+
+def _iter_pages_parallel(pdf_path, indices, workers, is_cancelled=None, backend_name=None):
+    """(oldalindex, szöveg) párokat ad a befejeződés sorrendjében."""
+    # Kis darabok, hogy a progress és a megszakítás sűrűn érvényesüljön
+    chunk_size = max(1, math.ceil(len(indices) / (workers * 4)))
+    executor, cancel_event = cancellable_process_pool(workers)
+    try:
+        pending = {
+            executor.submit(
+                _extract_pages, pdf_path, indices[start : start + chunk_size], backend_name
+            )
+            for start in range(0, len(indices), chunk_size)
+        }
+        while pending:
+            _raise_if_cancelled(is_cancelled)
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk_indices, chunk_texts = future.result()
+                yield from zip(chunk_indices, chunk_texts)
+    finally:
+        # Megszakítás vagy a generátor lezárása (korai leállás): a futó
+        # darabok is leállnak, a processzek nem dolgoznak tovább a háttérben
+        cancel_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_pages_sequential(document, indices, is_cancelled=None):
+    for index in indices:
+        _raise_if_cancelled(is_cancelled)
+        yield index, document.extract_page(index)
+
+
+def iter_pdf_pages(
+    pdf_path,
+    start_page=2,
+    progress_callback=None,
+    is_cancelled=None,
+    workers=1,
+    page_cache=None,
+    pdf_hash=None,
+    backend=None,
+    end_page=None,
+    skip_last_pages=0,
+):
+    """
+    A PDF oldalainak szövegét adja oldalsorrendben start_page-től, amint
+    az oldal (és az összes előtte lévő) elkészült.
+    workers > 1 esetén az oldaltartományt több processz dolgozza fel,
+    workers=None esetén az oldalszám alapján automatikusan választ.
+    page_cache (PageTextCache) megadásakor csak a cache-ben nem szereplő
+    oldalak kerülnek kinyerésre. A backend a pdf_backends egyik neve
+    (alapértelmezés: PyPDF2).
+    end_page (1-alapú, zárt) és skip_last_pages az oldaltartomány végét
+    korlátozza. A generátor idő előtti lezárásakor a még futó kinyerés
+    leáll, az addig kinyert oldalak a cache-be kerülnek.
+    """
+    backend = get_backend(backend)
+    first = start_page - 1
+    if page_cache is not None:
+        pdf_hash = _cache_key(backend, pdf_hash or file_sha256(pdf_path))
+        cached = page_cache.get_document(pdf_hash, first, end_page, skip_last_pages)
+        if cached is not None:
+            if progress_callback:
+                progress_callback("PDF oldalak olvasása (cache)...", len(cached), len(cached))
+            yield from cached
+            return
+
+    document = backend.open(pdf_path)
+    extracted = None
+    new_texts = {}
+    page_keys = {}
+    try:
+        last = resolve_last_index(document.page_count, first, end_page, skip_last_pages)
+        indices = list(range(first, last))
+        total = len(indices)
+        texts = {}
+        if page_cache is not None:
+            if progress_callback:
+                progress_callback("PDF oldalak ellenőrzése...", 0, 0)
+            reader = document.reader or PdfReader(pdf_path)
+            page_keys = {
+                i: _cache_key(backend, page_fingerprint(reader.pages[i])) for i in indices
+            }
+            texts = page_cache.get_pages(page_keys)
+        missing = [i for i in indices if i not in texts]
+
+        if workers is None:
+            workers = default_pdf_workers(len(missing))
+        if workers > 1 and len(missing) > 1:
+            extracted = _iter_pages_parallel(
+                pdf_path, missing, workers, is_cancelled, backend_name=backend.name
+            )
+        else:
+            extracted = _iter_pages_sequential(document, missing, is_cancelled)
+
+        position = 0
+        done = len(texts)
+        while position < total and indices[position] in texts:
+            yield texts.pop(indices[position])
+            position += 1
+        for index, text in extracted:
+            texts[index] = text
+            new_texts[index] = text
+            done += 1
+            if progress_callback:
+                progress_callback("PDF oldalak olvasása...", done, total)
+            while position < total and indices[position] in texts:
+                yield texts.pop(indices[position])
+                position += 1
+    finally:
+        if extracted is not None:
+            extracted.close()
+        try:
+            if page_cache is not None and page_keys:
+                page_cache.put_document(
+                    pdf_hash,
+                    document.page_count,
+                    page_keys,
+                    {page_keys[i]: text for i, text in new_texts.items()},
+                )
+        finally:
+            document.close()
+
+
 def extract_text_from_pdf(
-    pdf_path, start_page=2, progress_callback=None, is_cancelled=None
+    pdf_path,
+    start_page=2,
+    progress_callback=None,
+    is_cancelled=None,
+    workers=1,
+    page_cache=None,
+    backend=None,
 ):
-    reader = PdfReader(pdf_path)
-    pages = reader.pages[start_page - 1 :]
-    total = len(pages)
-    texts = []
-    for index, page in enumerate(pages, start=1):
-        _raise_if_cancelled(is_cancelled)
-        if progress_callback:
-            progress_callback("PDF oldalak olvasása...", index, total)
-        texts.append(page.extract_text() or "")
-    return "\n".join(texts)
+    return "\n".join(
+        iter_pdf_pages(
+            pdf_path,
+            start_page=start_page,
+            progress_callback=progress_callback,
+            is_cancelled=is_cancelled,
+            workers=workers,
+            page_cache=page_cache,
+            backend=backend,
+        )
+    )
 
 
 def categorize_line(line):
-    for category, keywords in categories.items():
-        if any(keyword in line for keyword in keywords):
-            return category
-    return None
+    return CATEGORY_MATCHER.categorize(line)
 
 
 def extract_amount(line):
-    matches = list(re.finditer(r"(\d[\d\s\xa0\u202f]*\d)\s*HUF", line))
-    if matches:
-        number = "".join(filter(str.isdigit, matches[-1].group(1)))
-        return float(number[2:]) if len(number) > 2 else 0.0
-    return 0.0
+    return parse_amount(line)
 
 
-def process_vehicles(
-    text,
+VEHICLE_PATTERN = re.compile(
+    r"\n\d+\s+(\d+\/[A-Z0-9\-]+)\s+(.+?)\s+(\d[\d\s\xa0]*\d)\s+HUF"
+)
+
+
+def iter_vehicle_blocks(pages, is_cancelled=None):
+    """
+    (autó név, blokk szöveg) párokat ad az oldalak folyamából, amint egy
+    autó blokkja lezárult (azaz megjelent a következő autó fejléce).
+
+    Az oldalak "\\n"-nel fűződnek össze, mint az extract_text_from_pdf-ben,
+    így az oldalhatáron átnyúló blokkok is egyben maradnak. A pufferben
+    csak az utolsó, még nyitott blokk szövege marad meg.
+    """
+    buffer = None
+    for page in pages:
+        _raise_if_cancelled(is_cancelled)
+        buffer = page if buffer is None else buffer + "\n" + page
+        matches = list(VEHICLE_PATTERN.finditer(buffer))
+        if len(matches) < 2:
+            continue
+        for m, next_m in zip(matches, matches[1:]):
+            yield f"{m.group(1)} {m.group(2)}".strip(), buffer[m.end() : next_m.start()]
+        buffer = buffer[matches[-1].start() :]
+    if buffer is None:
+        return
+    m = VEHICLE_PATTERN.search(buffer)
+    if m is not None:
+        yield f"{m.group(1)} {m.group(2)}".strip(), buffer[m.end() :]
+
+
+def page_has_vehicle_content(page, matcher=None):
+    """Autó fejléc vagy kategória kulcsszó van-e az oldalon."""
+    return (
+        VEHICLE_PATTERN.search("\n" + page) is not None
+        or (matcher or CATEGORY_MATCHER).matches_any(page)
+    )
+
+
+def iter_tracked_pages(pdf_path, tracker, start_page=2, skip_last_pages=0, **kwargs):
+    """
+    Az iter_pdf_pages oldalait a tracker-en (VehiclePageTracker) át adja.
+    Ha a skip_last_pages miatt kihagyott záró oldalak előtti utolsó oldalon
+    még autó tartalom volt, a megjegyzett tartomány nem érvényes erre a
+    PDF-re: a kihagyott oldalak is beolvasásra kerülnek.
+    """
+    yield from tracker.wrap(
+        iter_pdf_pages(
+            pdf_path, start_page=start_page, skip_last_pages=skip_last_pages, **kwargs
+        )
+    )
+    if (
+        skip_last_pages
+        and not tracker.stopped_early
+        and tracker.last_vehicle_page is not None
+        and tracker.last_vehicle_page == tracker.pages_seen - 1
+    ):
+        tracker.range_exceeded = True
+        yield from tracker.wrap(
+            iter_pdf_pages(pdf_path, start_page=start_page + tracker.pages_seen, **kwargs)
+        )
+
+
+def summarize_vehicle_block(vehicle_name, block, multiplier=1.27, matcher=None):
+    """A blokk sorait kategorizálja; (eredmény, read_data sorok) párt ad."""
+    classify = (matcher or CATEGORY_MATCHER).classify
+    grouped = defaultdict(float)
+    lines = []
+    for line in block.splitlines():
+        line = line.strip()
+        category, amount = classify(line)
+        lines.append([vehicle_name, line, category or "", amount or ""])
+        if category and isinstance(amount, (int, float)):
+            grouped[category] += amount
+    result = (
+        vehicle_name,
+        {cat: round(val * multiplier, 2) for cat, val in grouped.items()},
+    )
+    return result, lines
+
+
+def process_vehicle_pages(
+    pages,
     multiplier=1.27,
     read_data_path=None,
     progress_callback=None,
     is_cancelled=None,
+    matcher=None,
+    line_store=None,
+    partial_callback=None,
 ):
+    """
+    Az oldalak folyamából dolgozza fel az autókat, miközben a read_data.csv
+    sorai folyamatosan íródnak. A pages lehet az iter_pdf_pages generátora,
+    így a feldolgozás átfed a PDF olvasással. A line_store
+    (LineStoreBuilder) megadásakor a kategorizált sorok oszlopos
+    formában is összegyűlnek. A partial_callback autónként megkapja a
+    read_data sorokat (élő előnézet).
+    """
     if read_data_path is None:
         read_data_path = os.path.join(OUTPUT_DIR, "read_data.csv")
-    pattern = re.compile(
-        r"\n\d+\s+(\d+\/[A-Z0-9\-]+)\s+(.+?)\s+(\d[\d\s\xa0]*\d)\s+HUF"
-    )
-    matches = list(pattern.finditer(text))
-    results, all_lines = [], []
-    total = len(matches)
-    for idx, m in enumerate(matches):
-        _raise_if_cancelled(is_cancelled)
-        if progress_callback:
-            progress_callback("Autók feldolgozása...", idx + 1, total)
-        vehicle_name = f"{m.group(1)} {m.group(2)}".strip()
-        block = text[
-            m.end() : matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-        ]
-        grouped = defaultdict(float)
-        for line in block.splitlines():
-            line = line.strip()
-            category = categorize_line(line)
-            amount = extract_amount(line) if category else ""
-            all_lines.append([vehicle_name, line, category or "", amount or ""])
-            if category and isinstance(amount, (int, float)):
-                grouped[category] += amount
-        results.append(
-            (
-                vehicle_name,
-                {cat: round(val * multiplier, 2) for cat, val in grouped.items()},
-            )
-        )
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(read_data_path), exist_ok=True)
+    results = []
     with open(read_data_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(["Autó", "Sor", "Kategória", "Összeg"])
-        writer.writerows(all_lines)
+        writer.writerow(READ_DATA_HEADER)
+        for vehicle_name, block in iter_vehicle_blocks(pages, is_cancelled):
+            _raise_if_cancelled(is_cancelled)
+            if progress_callback:
+                progress_callback("Autók feldolgozása...", len(results) + 1, 0)
+            result, lines = summarize_vehicle_block(
+                vehicle_name, block, multiplier, matcher=matcher
+            )
+            results.append(result)
+            writer.writerows(lines)
+            if partial_callback:
+                partial_callback(READ_DATA_HEADER, lines)
+            if line_store is not None:
+                line_store.add_vehicle(vehicle_name, lines)
     return results
 
 
+def process_vehicles(
+    text,
+    multiplier=1.27,
+    read_data_path=None,
+    progress_callback=None,
+    is_cancelled=None,
+):
+    return process_vehicle_pages(
+        [text],
+        multiplier=multiplier,
+        read_data_path=read_data_path,
+        progress_callback=progress_callback,
+        is_cancelled=is_cancelled,
+    )
+
+
 def get_license_plate(vehicle_name):
     m = re.search(r"\b([A-Z]{4}-\d{3}|[A-Z]{3}-[A-Z0-9]{3,})\b", vehicle_name)
     return m.group(1) if m else vehicle_name.split()[0]
 
 
-def read_kgthely_mapping(excel_path):
+_kgthely_cache = {}
+
+
+def _load_kgthely_cache_file(file_hash):
+    try:
+        with open(KGTHELY_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if data.get("hash") != file_hash:
+        return None
+    return data.get("mapping")
+
+
+def _save_kgthely_cache_file(file_hash, mapping):
+    with atomic_write(KGTHELY_CACHE_PATH, encoding="utf-8") as f:
+        json.dump({"hash": file_hash, "mapping": mapping}, f, ensure_ascii=False)
+
+
+def read_kgthely_mapping(excel_path, use_cache=True):
+    """
+    Rendszám -> helyes költséghely szótár a ktghely Excelből.
+    Változatlan fájl (azonos hash) esetén a memóriából vagy a lemezes
+    cache-ből töltődik, az Excel újraolvasása nélkül.
+    """
+    file_hash = file_sha256(excel_path) if use_cache else None
+    if use_cache:
+        # Egy üres szótár is érvényes (cache-elt) eredmény
+        mapping = _kgthely_cache.get(file_hash)
+        if mapping is None:
+            mapping = _load_kgthely_cache_file(file_hash)
+        if mapping is not None:
+            _kgthely_cache[file_hash] = mapping
+            return dict(mapping)
+
     df = pd.read_excel(
-        excel_path, dtype=str, usecols=["frsz", "Helyes ktghely"], header=1
+        excel_path,
+        engine="calamine",
+        dtype=str,
+        usecols=["frsz", "Helyes ktghely"],
+        header=1,
     ).fillna("")
-    return {
-        str(row["frsz"]).strip(): str(row["Helyes ktghely"]).strip()
-        for _, row in df.iterrows()
-    }
+    mapping = dict(
+        zip(
+            df["frsz"].astype(str).str.strip(),
+            df["Helyes ktghely"].astype(str).str.strip(),
+        )
+    )
+
+    if use_cache:
+        _kgthely_cache.clear()
+        _kgthely_cache[file_hash] = mapping
+        try:
+            _save_kgthely_cache_file(file_hash, mapping)
+        except OSError:
+            pass
+    return dict(mapping)
+
+
+OUTPUT_HEADER = ["Autó", "Kategória", "Összeg HUF (ÁFÁ-val)", "Helyes ktghely"]
+
+
+def kgthely_rows(vehicle, cats, kgthely_dict, round_amounts="No"):
+    """Egy autó kimeneti CSV sorai: kategóriánként egy sor."""
+    plate = get_license_plate(vehicle)
+    helyes = kgthely_dict.get(plate, "")
+    rows = []
+    for i, cat in enumerate(categories):
+        value = cats.get(cat, 0.0)
+        val = (
+            f"{round(value):,}".replace(",", ".")
+            if round_amounts.lower() == "yes"
+            else f"{value:,.2f}".replace(",", ".")
+        )
+        rows.append([vehicle if i == 0 else "", cat, val, helyes if i == 0 else ""])
+    return rows
 
 
 def save_to_csv_with_kgthely(
@@ -136,55 +507,192 @@ def save_to_csv_with_kgthely(
         kgthely_dict = {}
     with open(output_path, "w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
-        writer.writerow(["Autó", "Kategória", "Összeg HUF (ÁFÁ-val)", "Helyes ktghely"])
+        writer.writerow(OUTPUT_HEADER)
         total = len(data)
         for index, (vehicle, cats) in enumerate(data, start=1):
             _raise_if_cancelled(is_cancelled)
             if progress_callback:
                 progress_callback("CSV mentése...", index, total)
-            plate = get_license_plate(vehicle)
-            helyes = kgthely_dict.get(plate, "")
-            for i, cat in enumerate(["Bérleti díj", "Biztosítás", "Autókarbantartás"]):
-                value = cats.get(cat, 0.0)
-                val = (
-                    f"{round(value):,}".replace(",", ".")
-                    if round_amounts.lower() == "yes"
-                    else f"{value:,.2f}".replace(",", ".")
-                )
-                writer.writerow(
-                    [vehicle if i == 0 else "", cat, val, helyes if i == 0 else ""]
-                )
+            writer.writerows(kgthely_rows(vehicle, cats, kgthely_dict, round_amounts))
 
 
-def run(pdf_path, excel_path, progress_callback=None, is_cancelled=None):
-    try:
-        text = extract_text_from_pdf(
-            pdf_path,
-            progress_callback=progress_callback,
-            is_cancelled=is_cancelled,
-        )
-        vehicles = process_vehicles(
-            text,
-            progress_callback=progress_callback,
-            is_cancelled=is_cancelled,
-        )
-        _raise_if_cancelled(is_cancelled)
+def extract_vehicles(
+    pdf_path,
+    pdf_hash,
+    read_data_path,
+    tracer,
+    multiplier=1.27,
+    progress_callback=None,
+    is_cancelled=None,
+    use_line_store=True,
+    backend=None,
+    end_page=None,
+    early_stop_pages=None,
+    remember_page_range=False,
+    partial_callback=None,
+    workers=None,
+):
+    """
+    A PDF autóinak kinyerése és kategorizálása: a run és a batch közös
+    lépése, így mindkettő ugyanazt az eredményt adja. Tárolt sorok esetén
+    azokból összesít, különben a PDF-et olvassa (a read_data sorai a
+    read_data_path-ra íródnak). A paraméterek jelentése a run-nál;
+    workers=None esetén az oldalszám alapján választ.
+    """
+    store_key = _cache_key(get_backend(backend), pdf_hash)
+    # Egy oldaltartomány sorai nem a teljes PDF-et írják le
+    use_line_store = use_line_store and end_page is None
+    store = (
+        load_line_store(LINE_STORE_DIR, store_key, categories)
+        if use_line_store
+        else None
+    )
+    if store is not None:
         if progress_callback:
-            progress_callback("Excel beolvasása...", 0, 0)
-        kgthely = read_kgthely_mapping(excel_path)
-        output_csv = os.path.join(OUTPUT_DIR, "output.csv")
-        save_to_csv_with_kgthely(
-            vehicles,
-            output_path=output_csv,
-            kgthely_dict=kgthely,
-            round_amounts="Yes",
-            progress_callback=progress_callback,
-            is_cancelled=is_cancelled,
+            progress_callback("Tárolt sorok összesítése...", 0, 0)
+        with tracer.span("tarolt_sorok") as span:
+            vehicles = store.summarize(multiplier)
+            span.rows = len(vehicles)
+    else:
+        builder = LineStoreBuilder(categories)
+        range_memory = layout_key = None
+        skip_last_pages = 0
+        if remember_page_range and end_page is None:
+            range_memory = PageRangeMemory(PAGE_RANGE_PATH)
+            layout_key, page_count = pdf_layout(PdfReader(pdf_path))
+            skip_last_pages = range_memory.tail_pages(layout_key)
+        tracker = VehiclePageTracker(page_has_vehicle_content, early_stop_pages)
+        with (
+            tracer.span("pdf_feldolgozas") as span,
+            PageTextCache(PAGE_CACHE_PATH) as page_cache,
+        ):
+            pages = iter_tracked_pages(
+                pdf_path,
+                tracker,
+                skip_last_pages=skip_last_pages,
+                progress_callback=progress_callback,
+                is_cancelled=is_cancelled,
+                workers=workers,
+                page_cache=page_cache,
+                pdf_hash=pdf_hash,
+                backend=backend,
+                end_page=end_page,
+            )
+            vehicles = process_vehicle_pages(
+                pages,
+                multiplier=multiplier,
+                read_data_path=read_data_path,
+                is_cancelled=is_cancelled,
+                line_store=builder,
+                partial_callback=partial_callback,
+            )
+            span.rows = tracker.pages_seen
+        # Csak olyan futás alapján jegyezzük meg a tartományt és a
+        # sorokat, ami a záró oldalakat is látta (nem hagyott ki
+        # oldalt, és korai leállás nélkül a PDF végéig olvasott).
+        read_all = not tracker.stopped_early and (
+            not skip_last_pages or tracker.range_exceeded
+        )
+        tail_pages = (
+            tracker.tail_pages(page_count)
+            if range_memory is not None and read_all
+            else None
         )
+        if tail_pages is not None:
+            try:
+                range_memory.remember(layout_key, tail_pages)
+            except OSError:
+                pass
+        if use_line_store and read_all:
+            try:
+                save_line_store(LINE_STORE_DIR, store_key, categories, builder.build())
+            except OSError:
+                pass
+    return vehicles
+
+
+def run(
+    pdf_path,
+    excel_path,
+    progress_callback=None,
+    is_cancelled=None,
+    multiplier=1.27,
+    round_amounts="Yes",
+    use_line_store=True,
+    backend=None,
+    end_page=None,
+    early_stop_pages=None,
+    remember_page_range=False,
+    partial_callback=None,
+):
+    """
+    Egy Merkantil PDF feldolgozása. A kategorizált sorok a PDF hash-e
+    szerint eltárolódnak, így egy másik szorzóval, kerekítéssel vagy
+    ktghely Excellel történő újrafuttatás a PDF újraolvasása nélkül,
+    a tárolt sorok csoportosításával készül el.
+
+    end_page megadásakor csak az oldaltartomány kerül feldolgozásra.
+    Opcionális gyorsítások (alapból kikapcsolva, a hívó kapcsolja be):
+    early_stop_pages egymást követő autó nélküli oldal után (ha már volt
+    autó) az olvasás leáll; None vagy 0 esetén a PDF végéig tart.
+    remember_page_range esetén az elrendezéshez (generátor, oldalméret)
+    megjegyzett, autó nélküli záró oldalak ki sem nyerődnek. Ilyen
+    részleges olvasásból sem tartomány, sem tárolt sor nem készül.
+    partial_callback: a PDF olvasása közben autónként a read_data sorok.
+    """
+    progress_callback = ProgressReporter.wrap(progress_callback)
+    workspace = JobWorkspace("merkantil")
+    try:
+        with Tracer("merkantil", source=os.path.basename(pdf_path)) as tracer:
+            with tracer.span("pdf_hash"):
+                pdf_hash = file_sha256(pdf_path)
+            vehicles = extract_vehicles(
+                pdf_path,
+                pdf_hash,
+                workspace.path("read_data.csv"),
+                tracer,
+                multiplier=multiplier,
+                progress_callback=progress_callback,
+                is_cancelled=is_cancelled,
+                use_line_store=use_line_store,
+                backend=backend,
+                end_page=end_page,
+                early_stop_pages=early_stop_pages,
+                remember_page_range=remember_page_range,
+                partial_callback=partial_callback,
+            )
+            _raise_if_cancelled(is_cancelled)
+            if progress_callback:
+                progress_callback("Excel beolvasása...", 0, 0)
+            with tracer.span("excel_olvasas") as span:
+                kgthely = read_kgthely_mapping(excel_path)
+                span.rows = len(kgthely)
+            with tracer.span("csv_iras", rows=len(vehicles)):
+                save_to_csv_with_kgthely(
+                    vehicles,
+                    output_path=workspace.path("output.csv"),
+                    kgthely_dict=kgthely,
+                    round_amounts=round_amounts,
+                    progress_callback=progress_callback,
+                    is_cancelled=is_cancelled,
+                )
+            # Tárolt sorokból futva nem készül read_data.csv
+            if os.path.exists(workspace.path("read_data.csv")):
+                workspace.publish("read_data.csv")
+            output_csv = workspace.publish("output.csv")
+            return {
+                "cancelled": False,
+                "output_csv": output_csv,
+                "output_dir": str(workspace.publish_dir),
+                "vehicle_count": len(vehicles),
+                "stats": tracer.stats(),
+            }
+    except OperationCancelled:
         return {
-            "cancelled": False,
-            "output_csv": output_csv,
-            "vehicle_count": len(vehicles),
+            "cancelled": True,
+            "output_csv": None,
+            "vehicle_count": 0,
+            "stats": tracer.stats(),
         }
-    except OperationCancelled:
-        return {"cancelled": True, "output_csv": None, "vehicle_count": 0}
+    finally:
+        workspace.cleanup()
@@ -1,3 +1,7 @@
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 
 
@@ -5,3 +9,32 @@ def ensure_directory(path: str | Path) -> Path:
     directory = Path(path)
     directory.mkdir(parents=True, exist_ok=True)
     return directory
+
+
+def file_sha256(path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_write(path: str | Path, mode: str = "w", encoding: str | None = None):
+    """
+    A célmappában egyedi ideiglenes fájlba ír (tempfile.mkstemp), és csak
+    sikeres írás után teszi a helyére (os.replace). Párhuzamos írók így nem
+    írják felül egymás ideiglenes fájlját; hibánál az törlődik.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from app.config.paths import LOGS_DIR
+
+PERF_LOG_PATH = LOGS_DIR / "perf.jsonl"
+
+_log_lock = threading.Lock()
+
+
+class Span:
+    """Egy mért szakasz: fali idő, CPU idő (a hívó szálé) és sorszám."""
+
+    __slots__ = (
+        "name",
+        "depth",
+        "rows",
+        "wall_seconds",
+        "cpu_seconds",
+        "_started_wall",
+        "_started_cpu",
+    )
+
+    def __init__(self, name: str, depth: int, rows: int | None = None):
+        self.name = name
+        self.depth = depth
+        self.rows = rows
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.thread_time()
+
+    def add_rows(self, count: int):
+        self.rows = (self.rows or 0) + count
+
+    def as_dict(self) -> dict:
+        data = {
+            "name": self.name,
+            "depth": self.depth,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+        }
+        if self.rows is not None:
+            data["rows"] = self.rows
+        return data
+
+
+class Tracer:
+    """
+    Könnyű szakaszmérő egy feladathoz. A span() kontextusok egymásba
+    ágyazhatók; a stats() a TaskResult.stats formátumú összesítést adja,
+    a with blokk vége pedig egy sort fűz a logs/perf.jsonl fájlhoz. A
+    státusz InterruptedError esetén "cancelled", más kivételnél "error".
+
+        try:
+            with Tracer("ksh") as tracer:
+                with tracer.span("beolvasás") as span:
+                    span.rows = len(rows)
+                return {..., "stats": tracer.stats()}
+        except InterruptedError:
+            return {"cancelled": True, "stats": tracer.stats()}
+    """
+
+    def __init__(self, job_name: str, log_path=None, **context):
+        self.job_name = job_name
+        self.log_path = log_path or PERF_LOG_PATH
+        self.context = context
+        self.spans: list[Span] = []
+        self.status = "ok"
+        self._depth = 0
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.thread_time()
+
+    def start_span(self, name: str, rows: int | None = None) -> Span:
+        """A span() with blokk nélküli párja; az end_span() zárja le."""
+        span = Span(name, self._depth, rows)
+        self.spans.append(span)
+        self._depth += 1
+        return span
+
+    def end_span(self, span: Span):
+        span.wall_seconds = time.perf_counter() - span._started_wall
+        span.cpu_seconds = time.thread_time() - span._started_cpu
+        self._depth -= 1
+
+    @contextmanager
+    def span(self, name: str, rows: int | None = None):
+        span = self.start_span(name, rows)
+        try:
+            yield span
+        finally:
+            self.end_span(span)
+
+    def stats(self) -> dict:
+        return {
+            "job": self.job_name,
+            "wall_seconds": round(time.perf_counter() - self._started_wall, 4),
+            "cpu_seconds": round(time.thread_time() - self._started_cpu, 4),
+            "spans": [span.as_dict() for span in self.spans],
+        }
+
+    def write_log(self):
+        record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "status": self.status,
+            **self.context,
+            **self.stats(),
+        }
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with _log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            # A mérési napló hiánya ne rontsa el a feladatot
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.status = "cancelled" if issubclass(exc_type, InterruptedError) else "error"
+        self.write_log()
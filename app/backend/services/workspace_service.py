@@ -0,0 +1,155 @@
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from app.config.paths import PROJECT_ROOT, module_output_dir
+from app.config.settings import (
+    PUBLISHED_RUNS_KEEP,
+    WORKSPACE_TEMP_DIR,
+    WORKSPACE_USE_TEMP,
+)
+
+# Ennyi idő után a (pl. összeomlás miatt) ottmaradt munkamappák törlődnek
+STALE_WORKSPACE_SECONDS = 24 * 3600
+# JobWorkspace.run_id formátum: csak ilyen nevű mappák törölhetők
+RUN_ID_PATTERN = re.compile(r"^\d{8}_\d{6}_[0-9a-f]{6}$")
+
+
+def _workspace_root(module_name: str, use_temp: bool) -> Path:
+    if use_temp:
+        base = Path(WORKSPACE_TEMP_DIR or tempfile.gettempdir()) / "workspaces"
+    else:
+        base = PROJECT_ROOT / "work"
+    root = base / module_name
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _prune_stale(root: Path):
+    limit = time.time() - STALE_WORKSPACE_SECONDS
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime < limit:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def prune_published_runs(
+    module_name: str,
+    keep: int = PUBLISHED_RUNS_KEEP,
+    exclude=(),
+):
+    """
+    Az output/<modul> mappában csak a keep legutóbbi futás mappa marad
+    (a run_id időbélyege, azonos másodpercen belül az mtime szerint). Más
+    nevű mappákhoz és fájlokhoz nem nyúl.
+    """
+    if keep is None or keep < 0:
+        return
+    root = module_output_dir(module_name)
+    try:
+        runs = sorted(
+            (entry.name[:15], entry.stat().st_mtime_ns, entry.name)
+            for entry in os.scandir(root)
+            if entry.is_dir(follow_symlinks=False)
+            and RUN_ID_PATTERN.match(entry.name)
+            and entry.name not in exclude
+        )
+    except OSError:
+        return
+    for _, _, name in runs[: max(0, len(runs) - keep)]:
+        shutil.rmtree(root / name, ignore_errors=True)
+
+
+def atomic_move(source: str | Path, target: str | Path) -> str:
+    """
+    A source fájlt a target helyére teszi úgy, hogy a target vagy a régi,
+    vagy a teljes új tartalmat mutassa. Másik fájlrendszerre a célmappában
+    lévő ideiglenes fájlon át másol, majd átnevez.
+    """
+    source, target = Path(source), Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(source, target)
+    except OSError:
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            shutil.copy2(source, tmp)
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        source.unlink()
+    return str(target)
+
+
+class JobWorkspace:
+    """
+    Egy feladat saját munkamappája. A köztes és végső fájlok itt
+    készülnek, a végső kimenetek a publish()-sal kerülnek atomikusan a
+    helyükre (alapértelmezés: output/<modul>/<futás azonosító>/). A
+    cleanup() csak a saját munkamappát törli, így párhuzamos vagy egymást
+    követő futások nem írják felül egymás fájljait.
+    """
+
+    def __init__(self, module_name: str, use_temp: bool = WORKSPACE_USE_TEMP):
+        self.module_name = module_name
+        self.run_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        root = _workspace_root(module_name, use_temp)
+        _prune_stale(root)
+        self.root = root / self.run_id
+        self.root.mkdir(parents=True)
+        self._publish_dir = None
+
+    @property
+    def publish_dir(self) -> Path:
+        if self._publish_dir is None:
+            self._publish_dir = module_output_dir(self.module_name) / self.run_id
+            # Az új futás mappája mellett csak a legutóbbiak maradnak meg
+            prune_published_runs(
+                self.module_name,
+                max(0, PUBLISHED_RUNS_KEEP - 1),
+                exclude=(self.run_id,),
+            )
+        return self._publish_dir
+
+    def path(self, name: str) -> str:
+        return str(self.root / name)
+
+    def publish(self, name: str, target: str | Path | None = None) -> str:
+        """A munkamappa name fájlját a target-re (vagy a publish_dir-be) teszi."""
+        return atomic_move(self.root / name, target or self.publish_dir / name)
+
+    def cleanup(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+def remove_published_dir(path: str | Path | None) -> bool:
+    """
+    Egy publish_dir törlése (pl. az eredmény megtekintése után). Csak egy
+    modul output mappáján belüli futás mappát töröl, magát a modul
+    mappát vagy más útvonalat nem.
+    """
+    if not path:
+        return False
+    path = Path(path).resolve()
+    output_root = (PROJECT_ROOT / "output").resolve()
+    if path.parent.parent != output_root or not path.is_dir():
+        return False
+    shutil.rmtree(path, ignore_errors=True)
+    return True
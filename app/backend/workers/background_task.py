@@ -1,12 +1,19 @@
 from typing import Any, Callable
 
-from PySide6.QtCore import QObject, Qt, QThread
+from PySide6.QtCore import QObject, Qt
 from PySide6.QtWidgets import QProgressDialog, QWidget
 
-from app.backend.workers.background_worker import BackgroundWorker
+from app.backend.workers.job_scheduler import JobScheduler
+from app.backend.workers.process_pool import THREAD_EXECUTOR
 
 
 class BackgroundTask(QObject):
+    """
+    Egy modul feladata a közös JobScheduler-en keresztül, saját progress
+    ablakkal. allow_queue esetén a gomb aktív marad, így újabb futások
+    sorba állíthatók; különben a feladat végéig le van tiltva.
+    """
+
     def __init__(
         self,
         parent: QWidget,
@@ -17,6 +24,13 @@ class BackgroundTask(QObject):
         on_result: Callable[[Any], None],
         on_error: Callable[[str], None],
         on_finished: Callable[[], None] | None = None,
+        executor: str | None = None,
+        memory_limit_mb: int | None = None,
+        priority: int = 0,
+        allow_queue: bool = True,
+        profile: bool | None = None,
+        on_started: Callable[[int], None] | None = None,
+        on_partial: Callable[[int, list, list], None] | None = None,
     ):
         super().__init__(parent)
         self.parent = parent
@@ -27,40 +41,70 @@ class BackgroundTask(QObject):
         self.on_result = on_result
         self.on_error = on_error
         self.on_finished = on_finished
-        self.thread = None
-        self.worker = None
+        # "thread" (alapértelmezés) vagy "process": lásd process_pool
+        self.executor = executor or THREAD_EXECUTOR
+        self.memory_limit_mb = memory_limit_mb
+        self.priority = priority
+        self.allow_queue = allow_queue
+        # True: cProfile + tracemalloc a logs/profiles-ba; None: a Feladatok
+        # panel "Profilozás" beállítása szerint
+        self.profile = profile
+        # A feladat indulása (job id), ill. részeredmény kötegek (job id,
+        # fejléc, sorok) a GUI szálon, pl. élő előnézethez
+        self.on_started = on_started
+        self.on_partial = on_partial
+        self.job = None
         self.progress_dialog = None
 
     def start(self):
-        self.button.setEnabled(False)
+        scheduler = JobScheduler.instance()
+        if not self.allow_queue:
+            self.button.setEnabled(False)
         self.progress_dialog = QProgressDialog(
             "Előkészítés...", "Mégse", 0, 100, self.parent
         )
         self.progress_dialog.setWindowTitle(self.title)
-        self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress_dialog.setWindowModality(
+            Qt.WindowModality.NonModal
+            if self.allow_queue
+            else Qt.WindowModality.WindowModal
+        )
         self.progress_dialog.setMinimumDuration(0)
         self.progress_dialog.setAutoClose(False)
         self.progress_dialog.setAutoReset(False)
+        self.progress_dialog.canceled.connect(self.cancel)
 
-        self.thread = QThread(self.parent)
-        self.worker = BackgroundWorker(self.func, *self.args)
-        self.worker.moveToThread(self.thread)
+        self.job = scheduler.submit(
+            self.title,
+            self.func,
+            self.args,
+            priority=self.priority,
+            owner=self.parent,
+            executor=self.executor,
+            memory_limit_mb=self.memory_limit_mb,
+            profile=self.profile,
+            on_started=self._on_started,
+            on_progress=self._on_progress,
+            on_partial=self._on_partial if self.on_partial is not None else None,
+            on_result=self._on_result,
+            on_error=self._on_error,
+            on_finished=self._on_finished,
+        )
+        position = scheduler.queue_position(self.job)
+        if position is not None and self.progress_dialog is not None:
+            self.progress_dialog.setRange(0, 0)
+            self.progress_dialog.setLabelText(f"Várakozás a sorban ({position}. hely)...")
 
-        self.thread.started.connect(self.worker.run)
-        self.worker.progress.connect(self._on_progress)
-        self.worker.result.connect(self._on_result)
-        self.worker.error.connect(self._on_error)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.finished.connect(self._on_finished)
-        self.progress_dialog.canceled.connect(self.worker.request_cancel)
+    def cancel(self):
+        if self.job is not None and not self.job.is_done:
+            JobScheduler.instance().cancel(self.job)
 
-        self.thread.start()
+    def _on_started(self, job):
+        if self.on_started is not None:
+            self.on_started(job.id)
 
-    def cancel(self):
-        if self.worker is not None:
-            self.worker.request_cancel()
+    def _on_partial(self, header: list, rows: list):
+        self.on_partial(self.job.id, header, rows)
 
     def _on_progress(self, message: str, current: int, total: int):
         if self.progress_dialog is None:
@@ -83,9 +127,8 @@ class BackgroundTask(QObject):
         QTimer.singleShot(100, lambda: self.on_error(error_message))
 
     def _on_finished(self):
-        self.button.setEnabled(True)
-        self.thread = None
-        self.worker = None
+        if not self.allow_queue:
+            self.button.setEnabled(True)
         self._close_progress_dialog()
         if self.on_finished is not None:
             self.on_finished()
@@ -3,32 +3,88 @@ from typing import Any, Callable
 
 from PySide6.QtCore import QObject, Signal, Slot
 
+from app.backend.workers.process_pool import (
+    PROCESS_EXECUTOR,
+    THREAD_EXECUTOR,
+    JobCancelled,
+    JobError,
+    describe_error,
+    get_process_pool,
+)
+from app.backend.workers.profiler import ProfiledCall
+from app.backend.workers.progress import PartialReporter, ProgressReporter
+
 
 class BackgroundWorker(QObject):
     progress = Signal(str, int, int)
+    # Részeredmény köteg: (fejléc, sorok), lásd stream_partial
+    partial = Signal(object, object)
     result = Signal(object)
     error = Signal(str)
     finished = Signal()
 
-    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        executor: str = THREAD_EXECUTOR,
+        memory_limit_mb: int | None = None,
+        profile: bool = False,
+        profile_label: str = "",
+        stream_partial: bool = False,
+        **kwargs: Any,
+    ):
         super().__init__()
+        if profile:
+            # A feladat cProfile alatt fut, a profil a logs/profiles-ba kerül
+            func = ProfiledCall(func, profile_label or getattr(func, "__name__", ""))
         self.func = func
         self.args = args
         self.kwargs = kwargs
+        self.executor = executor
+        self.memory_limit_mb = memory_limit_mb
+        # A func partial_callback(fejléc, sorok) argumentumot is kap
+        self.stream_partial = stream_partial
         self._cancel_requested = False
 
     @Slot()
     def run(self):
+        progress = ProgressReporter(self.report_progress)
+        partial = None
         try:
-            result = self.func(
-                *self.args,
-                progress_callback=self.report_progress,
-                is_cancelled=self.is_cancelled,
-                **self.kwargs,
-            )
+            if self.executor == PROCESS_EXECUTOR:
+                result = get_process_pool().run(
+                    self.func,
+                    self.args,
+                    self.kwargs,
+                    progress_callback=progress,
+                    is_cancelled=self.is_cancelled,
+                    memory_limit_mb=self.memory_limit_mb,
+                    partial_callback=self.partial.emit if self.stream_partial else None,
+                )
+            else:
+                kwargs = self.kwargs
+                if self.stream_partial:
+                    partial = PartialReporter(self.partial.emit)
+                    kwargs = {**kwargs, "partial_callback": partial}
+                result = self.func(
+                    *self.args,
+                    progress_callback=progress,
+                    is_cancelled=self.is_cancelled,
+                    **kwargs,
+                )
+            progress.flush()
+            if partial is not None:
+                partial.flush()
             self.result.emit(result)
+        except JobCancelled:
+            # A worker processz leállítva, részeredmény nincs
+            self.result.emit({"cancelled": True})
+        except JobError as exc:
+            self.error.emit(str(exc))
         except Exception as exc:
-            self.error.emit(f"{exc}\n\n{traceback.format_exc()}")
+            message = describe_error(exc, self.memory_limit_mb)
+            self.error.emit(f"{message}\n\n{traceback.format_exc()}")
         finally:
             self.finished.emit()
 
@@ -0,0 +1,278 @@
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from app.backend.workers.background_worker import BackgroundWorker
+from app.backend.workers.process_pool import THREAD_EXECUTOR
+from app.config.settings import JOB_MAX_CONCURRENCY
+
+# Ennyi lezárult feladat marad meg a listában
+MAX_FINISHED_JOBS = 100
+
+
+class JobState:
+    QUEUED = "Sorban"
+    RUNNING = "Fut"
+    FINISHED = "Kész"
+    FAILED = "Hiba"
+    CANCELLED = "Megszakítva"
+
+
+@dataclass(eq=False)
+class Job:
+    id: int
+    title: str
+    func: Callable[..., Any]
+    args: tuple[Any, ...] = ()
+    priority: int = 0
+    owner: Any = None
+    executor: str = THREAD_EXECUTOR
+    memory_limit_mb: int | None = None
+    profile: bool = False
+    on_started: Callable[["Job"], None] | None = None
+    on_progress: Callable[[str, int, int], None] | None = None
+    on_partial: Callable[[list, list], None] | None = None
+    on_result: Callable[[Any], None] | None = None
+    on_error: Callable[[str], None] | None = None
+    on_finished: Callable[[], None] | None = None
+    state: str = JobState.QUEUED
+    message: str = ""
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def wait_seconds(self) -> float:
+        end = self.started_at if self.started_at is not None else (
+            self.finished_at if self.finished_at is not None else time.monotonic()
+        )
+        return end - self.submitted_at
+
+    @property
+    def run_seconds(self) -> float | None:
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def is_done(self) -> bool:
+        return self.state in (JobState.FINISHED, JobState.FAILED, JobState.CANCELLED)
+
+
+class _JobRunner(QObject):
+    """A worker jelzéseit a GUI szálon fogadja egy adott feladathoz."""
+
+    def __init__(self, scheduler: "JobScheduler", job: Job):
+        super().__init__(scheduler)
+        self.scheduler = scheduler
+        self.job = job
+        self.thread = None
+        self.worker = None
+
+    def start(self):
+        job = self.job
+        self.thread = QThread(self)
+        self.worker = BackgroundWorker(
+            job.func,
+            *job.args,
+            executor=job.executor,
+            memory_limit_mb=job.memory_limit_mb,
+            profile=job.profile,
+            profile_label=job.title,
+            stream_partial=job.on_partial is not None,
+        )
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self._on_progress)
+        self.worker.partial.connect(self._on_partial)
+        self.worker.result.connect(self._on_result)
+        self.worker.error.connect(self._on_error)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self._on_thread_finished)
+
+        self.thread.start()
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.request_cancel()
+
+    def _on_progress(self, message: str, current: int, total: int):
+        if message != self.job.message:
+            self.job.message = message
+            self.scheduler.job_changed.emit(self.job)
+        if self.job.on_progress is not None:
+            self.job.on_progress(message, current, total)
+
+    def _on_partial(self, header: list, rows: list):
+        if self.job.on_partial is not None:
+            self.job.on_partial(header, rows)
+
+    def _on_result(self, result: Any):
+        cancelled = isinstance(result, dict) and result.get("cancelled")
+        self.job.state = JobState.CANCELLED if cancelled else JobState.FINISHED
+        profile = result.get("profile") if isinstance(result, dict) else None
+        if profile:
+            self.job.message = f"Profil: {profile['summary_path']}"
+        if self.job.on_result is not None:
+            self.job.on_result(result)
+
+    def _on_error(self, error_message: str):
+        self.job.state = JobState.FAILED
+        self.job.message = error_message.splitlines()[0] if error_message else ""
+        if self.job.on_error is not None:
+            self.job.on_error(error_message)
+
+    def _on_thread_finished(self):
+        self.thread.deleteLater()
+        self.thread = None
+        self.worker = None
+        self.scheduler._job_done(self)
+
+
+class JobScheduler(QObject):
+    """
+    Közös feladatütemező a modulokhoz: prioritásos sor, legfeljebb
+    max_concurrency egyszerre futó feladat. A GUI szálról használandó.
+    """
+
+    job_added = Signal(object)
+    job_changed = Signal(object)
+
+    _instance = None
+
+    def __init__(self, max_concurrency: int = JOB_MAX_CONCURRENCY, parent=None):
+        super().__init__(parent)
+        self.max_concurrency = max(1, max_concurrency)
+        self.jobs: list[Job] = []
+        self._queue: list[tuple[int, int, Job]] = []
+        self._runners: dict[Job, _JobRunner] = {}
+        self._ids = itertools.count(1)
+        # A Feladatok panelről kapcsolható: az új feladatok profilozva futnak
+        self.profile_enabled = False
+
+    @classmethod
+    def instance(cls) -> "JobScheduler":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def submit(
+        self,
+        title: str,
+        func: Callable[..., Any],
+        args: tuple[Any, ...] = (),
+        priority: int = 0,
+        owner: Any = None,
+        executor: str | None = None,
+        memory_limit_mb: int | None = None,
+        profile: bool | None = None,
+        on_started: Callable[[Job], None] | None = None,
+        on_progress: Callable[[str, int, int], None] | None = None,
+        on_result: Callable[[Any], None] | None = None,
+        on_error: Callable[[str], None] | None = None,
+        on_finished: Callable[[], None] | None = None,
+        on_partial: Callable[[list, list], None] | None = None,
+    ) -> Job:
+        """
+        Sorba állít egy feladatot; a nagyobb priority előbb indul. profile
+        None esetén a profile_enabled beállítás dönt. on_partial megadásakor
+        a func partial_callback-et is kap, a részeredmények ide érkeznek.
+        Az on_started a Sorban -> Fut átmenetkor hívódik (akár még a submit
+        visszatérése előtt).
+        """
+        job = Job(
+            id=next(self._ids),
+            title=title,
+            func=func,
+            args=tuple(args),
+            priority=priority,
+            owner=owner,
+            executor=executor or THREAD_EXECUTOR,
+            memory_limit_mb=memory_limit_mb,
+            profile=self.profile_enabled if profile is None else profile,
+            on_started=on_started,
+            on_progress=on_progress,
+            on_partial=on_partial,
+            on_result=on_result,
+            on_error=on_error,
+            on_finished=on_finished,
+        )
+        self.jobs.append(job)
+        heapq.heappush(self._queue, (-priority, job.id, job))
+        self.job_added.emit(job)
+        self._dispatch()
+        return job
+
+    def queue_position(self, job: Job) -> int | None:
+        """A sorban álló feladat 1-alapú helye, egyébként None."""
+        if job.state != JobState.QUEUED:
+            return None
+        ahead = sum(1 for entry in self._queue if entry < (-job.priority, job.id, job))
+        return ahead + 1
+
+    def running_count(self) -> int:
+        return len(self._runners)
+
+    def cancel(self, job: Job):
+        if job.state == JobState.QUEUED:
+            self._queue = [entry for entry in self._queue if entry[2] is not job]
+            heapq.heapify(self._queue)
+            job.state = JobState.CANCELLED
+            job.finished_at = time.monotonic()
+            self.job_changed.emit(job)
+            if job.on_result is not None:
+                job.on_result({"cancelled": True})
+            if job.on_finished is not None:
+                job.on_finished()
+            self._prune()
+            return
+        runner = self._runners.get(job)
+        if runner is not None:
+            runner.cancel()
+
+    def cancel_owner(self, owner: Any):
+        for job in list(self.jobs):
+            if job.owner is owner and not job.is_done:
+                self.cancel(job)
+
+    def _dispatch(self):
+        while self._queue and len(self._runners) < self.max_concurrency:
+            _, _, job = heapq.heappop(self._queue)
+            if job.state != JobState.QUEUED:
+                continue
+            job.state = JobState.RUNNING
+            job.started_at = time.monotonic()
+            runner = _JobRunner(self, job)
+            self._runners[job] = runner
+            self.job_changed.emit(job)
+            if job.on_started is not None:
+                job.on_started(job)
+            runner.start()
+        # A sorban maradt feladatok helye változhatott
+        for _, _, job in self._queue:
+            self.job_changed.emit(job)
+
+    def _job_done(self, runner: _JobRunner):
+        job = runner.job
+        self._runners.pop(job, None)
+        runner.deleteLater()
+        job.finished_at = time.monotonic()
+        if job.state == JobState.RUNNING:
+            job.state = JobState.FINISHED
+        self.job_changed.emit(job)
+        if job.on_finished is not None:
+            job.on_finished()
+        self._prune()
+        self._dispatch()
+
+    def _prune(self):
+        finished = [job for job in self.jobs if job.is_done]
+        for job in finished[:-MAX_FINISHED_JOBS]:
+            self.jobs.remove(job)
@@ -0,0 +1,365 @@
+"""
+Előre elindított worker processzek a CPU-igényes modul feladatokhoz.
+
+A GUI processzben futó QThread a GIL miatt akadozást okoz a tiszta Python
+ciklusoknál, és csak a kooperatív ellenőrzési pontokon szakítható meg. Itt
+a feladat egy már futó (pandas/openpyxl importált) worker processzben fut,
+a progress a worker csatornáján érkezik vissza, megszakításkor pedig a
+processz rövid türelmi idő után leállításra (kill) és pótlásra kerül.
+
+Ez a modul nem importálhat Qt-t: a worker processzek is betöltik.
+"""
+
+import atexit
+import importlib
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+
+from app.backend.services.logging_service import configure_logging
+from app.backend.workers.progress import PartialReporter, ProgressReporter
+from app.config.settings import PROCESS_CANCEL_GRACE_SECONDS, PROCESS_POOL_SIZE
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+THREAD_EXECUTOR = "thread"
+PROCESS_EXECUTOR = "process"
+EXECUTORS = (THREAD_EXECUTOR, PROCESS_EXECUTOR)
+
+PRELOAD_MODULES = ("numpy", "pandas", "openpyxl")
+POLL_INTERVAL = 0.1
+MEMORY_CHECK_INTERVAL = 0.5
+MB = 1024 * 1024
+
+
+class JobCancelled(Exception):
+    """A feladatot megszakításkor le kellett állítani (kill)."""
+
+
+class JobError(Exception):
+    """A worker processzben keletkezett hiba (üzenet + traceback szöveg)."""
+
+
+def describe_error(exc, memory_limit_mb=None):
+    """A hiba első sora a Feladatok panelhez; üres üzenetű kivételeknél is."""
+    if isinstance(exc, MemoryError) and not str(exc):
+        if memory_limit_mb:
+            return f"A feladat túllépte a memóriakorlátot ({memory_limit_mb} MB)."
+        return "A feladat számára elfogyott a memória."
+    return str(exc) or type(exc).__name__
+
+
+def _current_vm_bytes():
+    # Linuxon a processz jelenlegi címtér mérete, máshol None
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _set_memory_limit(limit_mb):
+    # Csak psutil nélkül kell: különben a szülő az RSS-t méri. POSIX-on a
+    # processz címtér korlátja; a soft limit a hard limitig visszaemelhető,
+    # így feladatonként állítható. Az előtöltött numpy/pandas miatt a
+    # címtér már induláskor nagy, ezért a korlát a jelenlegi méret fölé kerül
+    if resource is None or psutil is not None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if limit_mb is None:
+        new_soft = hard
+    else:
+        current = _current_vm_bytes()
+        if current is None:
+            return
+        new_soft = current + limit_mb * MB
+        if hard != resource.RLIM_INFINITY:
+            new_soft = min(new_soft, hard)
+    if new_soft != soft:
+        resource.setrlimit(resource.RLIMIT_AS, (new_soft, hard))
+
+
+def _worker_main(conn, preload):
+    for module_name in preload:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+    while True:
+        try:
+            command = conn.recv()
+        except (EOFError, OSError):
+            return
+        if command is None:
+            return
+        if command == "cancel":
+            # Egy már befejeződött feladatnak szóló megszakítás
+            continue
+        _, func, args, kwargs, memory_limit_mb, stream_partial = command
+        cancelled = False
+
+        def is_cancelled():
+            nonlocal cancelled
+            while not cancelled and conn.poll():
+                cancelled = conn.recv() in ("cancel", None)
+            return cancelled
+
+        progress = ProgressReporter(lambda *update: conn.send(("progress", *update)))
+        partial = None
+        if stream_partial:
+            # A kötegelés itt történik, így a csatornán is csak ritkított jelzés megy
+            partial = PartialReporter(lambda *batch: conn.send(("partial", *batch)))
+            kwargs = {**kwargs, "partial_callback": partial}
+        try:
+            _set_memory_limit(memory_limit_mb)
+            result = func(
+                *args,
+                progress_callback=progress,
+                is_cancelled=is_cancelled,
+                **kwargs,
+            )
+            progress.flush()
+            if partial is not None:
+                partial.flush()
+            conn.send(("result", result))
+        except Exception as exc:
+            message = describe_error(exc, memory_limit_mb)
+            conn.send(("error", f"{message}\n\n{traceback.format_exc()}"))
+        finally:
+            try:
+                _set_memory_limit(None)
+            except (OSError, ValueError):
+                pass
+
+
+def _process_rss_mb(pid):
+    # psutil nélkül (Windowson) nincs kívülről mért memóriakorlát
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss / MB
+    except psutil.Error:
+        return None
+
+
+class _PoolWorker:
+    def __init__(self, context, preload):
+        self.conn, child_conn = context.Pipe()
+        # Nem daemon: a Merkantil feladat saját processzeket is indít
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, preload),
+            name="job-worker",
+            daemon=False,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, timeout=2.0):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(5.0)
+        self.conn.close()
+
+
+class WarmProcessPool:
+    """
+    size darab előre indított worker processz. Egy processz egyszerre egy
+    feladatot futtat, így a pool mérete a párhuzamos feladatok korlátja is;
+    a többi feladat a szabad processzre vár.
+    """
+
+    def __init__(self, size=PROCESS_POOL_SIZE, preload=PRELOAD_MODULES):
+        self.size = max(1, size)
+        self.preload = tuple(preload)
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._workers = set()
+        # Az indítás alatt álló processzek száma (_lock alatt): a start() és
+        # a _release() pótlása együtt se indítson size-nál többet
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._limit_warning_logged = False
+
+    def start(self):
+        with self._lock:
+            missing = self.size - len(self._workers) - self._pending
+            self._pending += max(0, missing)
+        for _ in range(missing):
+            self._spawn()
+
+    def _spawn(self):
+        try:
+            worker = _PoolWorker(self._context, self.preload)
+        finally:
+            with self._lock:
+                self._pending -= 1
+        with self._lock:
+            if self._closed:
+                worker.stop()
+                return
+            self._workers.add(worker)
+        self._idle.put(worker)
+
+    def _acquire(self, is_cancelled=None):
+        while True:
+            if is_cancelled and is_cancelled():
+                return None
+            try:
+                return self._idle.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def _release(self, worker, healthy):
+        if healthy:
+            self._idle.put(worker)
+            return
+        with self._lock:
+            self._workers.discard(worker)
+            self._pending += 1
+        if worker.process.is_alive():
+            worker.kill()
+        # A pótlás (spawn + előtöltés) ne késleltesse az eredményt
+        threading.Thread(target=self._spawn, daemon=True).start()
+
+    def run(
+        self,
+        func,
+        args=(),
+        kwargs=None,
+        progress_callback=None,
+        is_cancelled=None,
+        memory_limit_mb=None,
+        partial_callback=None,
+    ):
+        """
+        A func(*args, progress_callback=..., is_cancelled=..., **kwargs)
+        hívást egy worker processzben futtatja, és visszaadja az eredményét.
+        A func és az eredmény legyen pickle-özhető (modul szintű függvény).
+        partial_callback megadásakor a func partial_callback argumentumot is
+        kap, a részeredmény kötegek (fejléc, sorok) ide érkeznek vissza.
+        """
+        if memory_limit_mb and psutil is None and resource is None:
+            self._warn_unenforced_limit(memory_limit_mb)
+        if not self._workers and not self._pending:
+            self.start()
+        worker = self._acquire(is_cancelled)
+        if worker is None:
+            raise JobCancelled()
+        healthy = False
+        try:
+            worker.conn.send(
+                (
+                    "run",
+                    func,
+                    tuple(args),
+                    kwargs or {},
+                    memory_limit_mb,
+                    partial_callback is not None,
+                )
+            )
+            # Az előtöltött modulok (pandas...) memóriája nem a feladaté: a
+            # korlát a feladat indulásakori RSS fölött értendő
+            baseline_mb = _process_rss_mb(worker.process.pid) if memory_limit_mb else None
+            cancel_deadline = None
+            next_memory_check = time.monotonic() + MEMORY_CHECK_INTERVAL
+            while True:
+                now = time.monotonic()
+                if is_cancelled and is_cancelled():
+                    if cancel_deadline is None:
+                        worker.conn.send("cancel")
+                        cancel_deadline = now + PROCESS_CANCEL_GRACE_SECONDS
+                    elif now >= cancel_deadline:
+                        raise JobCancelled()
+                if memory_limit_mb and now >= next_memory_check:
+                    next_memory_check = now + MEMORY_CHECK_INTERVAL
+                    rss_mb = _process_rss_mb(worker.process.pid)
+                    if (
+                        rss_mb is not None
+                        and baseline_mb is not None
+                        and rss_mb - baseline_mb > memory_limit_mb
+                    ):
+                        raise MemoryError(
+                            f"A feladat túllépte a memóriakorlátot ({memory_limit_mb} MB)."
+                        )
+                if not worker.conn.poll(POLL_INTERVAL):
+                    if not worker.process.is_alive():
+                        raise RuntimeError(
+                            "A worker processz váratlanul leállt "
+                            f"(kód: {worker.process.exitcode})."
+                        )
+                    continue
+                kind, *payload = worker.conn.recv()
+                if kind == "progress":
+                    if progress_callback:
+                        progress_callback(*payload)
+                    continue
+                if kind == "partial":
+                    if partial_callback:
+                        partial_callback(*payload)
+                    continue
+                healthy = True
+                if kind == "result":
+                    return payload[0]
+                raise JobError(payload[0])
+        except (EOFError, OSError) as exc:
+            raise RuntimeError(f"Megszakadt a kapcsolat a worker processzel: {exc}") from exc
+        finally:
+            self._release(worker, healthy)
+
+    def _warn_unenforced_limit(self, memory_limit_mb):
+        if self._limit_warning_logged:
+            return
+        self._limit_warning_logged = True
+        configure_logging().getChild("process_pool").warning(
+            "A %d MB memóriakorlát nem érvényesíthető (nincs psutil): "
+            "a feladatok korlát nélkül futnak.",
+            memory_limit_mb,
+        )
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmProcessPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def start_process_pool():
+    """A pool előindítása (pl. alkalmazás induláskor), hogy az első feladat se várjon."""
+    get_process_pool().start()
@@ -0,0 +1,130 @@
+"""
+Egy feladat opcionális profilozása (cProfile + tracemalloc).
+
+A ProfiledCall a feladat függvényét csomagolja be, így ugyanúgy fut
+QThread-ben és a process_pool worker processzében is (pickle-özhető). A
+.prof fájl (pstats / snakeviz formátum) és a top-N szöveges összesítő a
+logs/profiles mappába kerül.
+
+Ez a modul nem importálhat Qt-t: a worker processzek is betöltik.
+"""
+
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+
+from app.config.paths import LOGS_DIR
+from app.config.settings import PROFILE_TOP_N
+
+PROFILES_DIR = LOGS_DIR / "profiles"
+MB = 1024 * 1024
+
+# A tracemalloc processz szintű: több egyszerre profilozott feladat közösen
+# használja, és csak az utolsó állítja le
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc() -> float:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _, peak = tracemalloc.get_traced_memory()
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+    return peak / MB
+
+
+def _profile_stem(label: str) -> str:
+    name = re.sub(r"[^\w-]+", "_", label).strip("_") or "feladat"
+    return f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+def write_profile(
+    profiler: cProfile.Profile,
+    label: str,
+    seconds: float,
+    peak_mb: float,
+    top_n: int = PROFILE_TOP_N,
+) -> dict:
+    """A .prof és a top-N összesítő mentése; az útvonalakat adja vissza."""
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    stem = _profile_stem(label)
+    prof_path = PROFILES_DIR / f"{stem}.prof"
+    summary_path = PROFILES_DIR / f"{stem}.txt"
+    profiler.dump_stats(prof_path)
+
+    stream = io.StringIO()
+    stream.write(f"Feladat: {label}\n")
+    stream.write(f"Futási idő: {seconds:.2f} mp\n")
+    stream.write(f"Memória csúcs (tracemalloc): {peak_mb:.1f} MB\n\n")
+    stats = pstats.Stats(profiler, stream=stream).strip_dirs()
+    stream.write(f"--- Top {top_n} (kumulált idő) ---\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    stream.write(f"--- Top {top_n} (saját idő) ---\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top_n)
+    summary_path.write_text(stream.getvalue(), encoding="utf-8")
+
+    return {
+        "prof_path": str(prof_path),
+        "summary_path": str(summary_path),
+        "seconds": round(seconds, 3),
+        "tracemalloc_peak_mb": round(peak_mb, 1),
+    }
+
+
+class ProfiledCall:
+    """
+    A func hívását cProfile alatt futtatja, és a tracemalloc csúcsot is
+    méri. Dict eredmény esetén a profil adatai a "profile" kulcsba
+    kerülnek; hiba esetén is elkészül a profil.
+    """
+
+    def __init__(self, func, label: str, top_n: int = PROFILE_TOP_N):
+        self.func = func
+        self.label = label
+        self.top_n = top_n
+
+    def __call__(self, *args, **kwargs):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Már fut egy profilozó ebben a szálban: profil nélkül fut
+            return self.func(*args, **kwargs)
+        _start_tracemalloc()
+        started = time.perf_counter()
+        info = None
+        try:
+            result = self.func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            peak_mb = _stop_tracemalloc()
+            try:
+                info = write_profile(
+                    profiler,
+                    self.label,
+                    time.perf_counter() - started,
+                    peak_mb,
+                    self.top_n,
+                )
+            except OSError:
+                pass
+        if isinstance(result, dict) and info is not None:
+            result["profile"] = info
+        return result
@@ -1,4 +1,8 @@
+import time
 from dataclasses import dataclass
+from typing import Callable
+
+from app.config.settings import PARTIAL_MAX_RATE_HZ, PROGRESS_MAX_RATE_HZ
 
 
 @dataclass(slots=True)
@@ -7,3 +11,105 @@ class ProgressUpdate:
     current: int = 0
     total: int = 0
     indeterminate: bool = False
+
+
+class ProgressReporter:
+    """
+    Progress callback wrapper, ami időalapon ritkítja a jelzéseket.
+
+    Soronként hívható: legfeljebb max_rate_hz jelzést ad tovább
+    másodpercenként, de a szakaszváltást (új üzenet) és a végső értéket
+    (current >= total) mindig továbbítja. Az elnyelt utolsó értéket a
+    flush() küldi el.
+    """
+
+    __slots__ = ("_callback", "_min_interval", "_clock", "_last_emit", "_last_message", "_pending")
+
+    def __init__(
+        self,
+        callback: Callable[[str, int, int], None],
+        max_rate_hz: float = PROGRESS_MAX_RATE_HZ,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._callback = callback
+        self._min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self._clock = clock
+        self._last_emit = float("-inf")
+        self._last_message = None
+        self._pending = None
+
+    @classmethod
+    def wrap(cls, callback, max_rate_hz: float = PROGRESS_MAX_RATE_HZ):
+        if callback is None or isinstance(callback, cls):
+            return callback
+        return cls(callback, max_rate_hz=max_rate_hz)
+
+    def __call__(self, message: str, current: int, total: int):
+        now = self._clock()
+        if (
+            message != self._last_message
+            or (total > 0 and current >= total)
+            or now - self._last_emit >= self._min_interval
+        ):
+            self._emit(message, current, total, now)
+        else:
+            self._pending = (message, current, total)
+
+    def flush(self):
+        if self._pending is not None:
+            self._emit(*self._pending, self._clock())
+
+    def _emit(self, message: str, current: int, total: int, now: float):
+        self._pending = None
+        self._last_emit = now
+        self._last_message = message
+        self._callback(message, current, total)
+
+
+class PartialReporter:
+    """
+    Részeredmény callback wrapper: a (fejléc, sorok) kötegeket gyűjti, és
+    legfeljebb max_rate_hz alkalommal adja tovább másodpercenként, így a
+    GUI nem kap soronként jelzést. Fejlécváltáskor az addigi sorok
+    azonnal továbbmennek; a maradékot a flush() küldi el.
+    """
+
+    __slots__ = ("_callback", "_min_interval", "_clock", "_last_emit", "_header", "_rows")
+
+    def __init__(
+        self,
+        callback: Callable[[list, list], None],
+        max_rate_hz: float = PARTIAL_MAX_RATE_HZ,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._callback = callback
+        self._min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self._clock = clock
+        self._last_emit = float("-inf")
+        self._header = None
+        self._rows = []
+
+    @classmethod
+    def wrap(cls, callback, max_rate_hz: float = PARTIAL_MAX_RATE_HZ):
+        if callback is None or isinstance(callback, cls):
+            return callback
+        return cls(callback, max_rate_hz=max_rate_hz)
+
+    def __call__(self, header: list, rows: list):
+        header = list(header)
+        if self._rows and header != self._header:
+            self.flush()
+        self._header = header
+        self._rows.extend(list(row) for row in rows)
+        now = self._clock()
+        if now - self._last_emit >= self._min_interval:
+            self._emit(now)
+
+    def flush(self):
+        if self._rows:
+            self._emit(self._clock())
+
+    def _emit(self, now: float):
+        rows, self._rows = self._rows, []
+        self._last_emit = now
+        self._callback(self._header, rows)
@@ -0,0 +1,116 @@
+"""
+A GUI szál (Qt eseményhurok) blokkolásainak figyelése.
+
+A fő szálon egy QTimer heartbeat-et ad; egy segédszál figyeli, mikor volt
+az utolsó. Ha a késés átlépi a küszöböt, a segédszál a sys._current_frames
+alapján rögzíti a fő szál aktuális Python stackjét és naplózza, a
+blokkolás végén pedig a fő szál naplózza a teljes időtartamot.
+"""
+
+import sys
+import threading
+import time
+import traceback
+
+from PySide6.QtCore import QObject, QTimer
+
+from app.backend.services.logging_service import configure_logging
+from app.config.settings import (
+    STALL_HEARTBEAT_MS,
+    STALL_THRESHOLD_MS,
+    STALL_WATCHDOG_ENABLED,
+)
+
+
+class StallWatchdog(QObject):
+    def __init__(
+        self,
+        threshold_ms: int = STALL_THRESHOLD_MS,
+        heartbeat_ms: int = STALL_HEARTBEAT_MS,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.logger = configure_logging().getChild("watchdog")
+        self.stall_count = 0
+        self.max_stall_ms = 0.0
+        self.max_latency_ms = 0.0
+
+        # A watchdog-ot a fő (GUI) szálon kell létrehozni
+        self._main_ident = threading.get_ident()
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._stall_detected = False
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        with self._lock:
+            self._last_beat = time.monotonic()
+        self._timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="gui-stall-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+
+    def _beat(self):
+        now = time.monotonic()
+        with self._lock:
+            gap_ms = (now - self._last_beat) * 1000
+            self._last_beat = now
+            stalled = self._stall_detected
+            self._stall_detected = False
+        # Az eseményhurok késése: mennyivel később jött a heartbeat
+        self.max_latency_ms = max(self.max_latency_ms, gap_ms - self.heartbeat_ms)
+        if stalled:
+            self.stall_count += 1
+            self.max_stall_ms = max(self.max_stall_ms, gap_ms)
+            self.logger.warning(
+                "A GUI szál blokkolása véget ért: %.0f ms (stack: lásd az előző bejegyzést)",
+                gap_ms,
+            )
+
+    def _watch(self):
+        check_interval = max(self.heartbeat_ms, 50) / 1000
+        while not self._stop.wait(check_interval):
+            with self._lock:
+                last_beat = self._last_beat
+                already_detected = self._stall_detected
+            blocked_ms = (time.monotonic() - last_beat) * 1000
+            if already_detected or blocked_ms < self.threshold_ms + self.heartbeat_ms:
+                continue
+            frame = sys._current_frames().get(self._main_ident)
+            stack = (
+                "".join(traceback.format_stack(frame))
+                if frame is not None
+                else "(a fő szál stackje nem elérhető)\n"
+            )
+            with self._lock:
+                # Időközben jött heartbeat: nem blokkolás volt
+                if self._last_beat != last_beat:
+                    continue
+                self._stall_detected = True
+            self.logger.warning(
+                "A GUI szál %.0f ms óta nem válaszol. Fő szál stack:\n%s",
+                blocked_ms,
+                stack,
+            )
+
+
+def start_stall_watchdog(parent=None) -> StallWatchdog | None:
+    """A watchdog indítása a fő szálról (STALL_WATCHDOG_ENABLED esetén)."""
+    if not STALL_WATCHDOG_ENABLED:
+        return None
+    watchdog = StallWatchdog(parent=parent)
+    watchdog.start()
+    return watchdog
@@ -14,3 +14,9 @@ def module_output_dir(module_name: str) -> Path:
     output_dir = PROJECT_ROOT / "output" / module_name
     output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
+
+
+def module_cache_dir(module_name: str) -> Path:
+    cache_dir = PROJECT_ROOT / "cache" / module_name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
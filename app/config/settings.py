@@ -1,3 +1,5 @@
+import os
+
 from app.config.constants import APP_NAME, GITHUB_OWNER, GITHUB_REPO
 
 DEBUG = True
@@ -5,3 +7,43 @@ ALLOW_PRERELEASES = False
 ALLOW_ZIP_FALLBACK = True
 INCREMENTAL_DEFAULT = True
 USER_AGENT = f"{APP_NAME}/2.0 (+https://github.com/{GITHUB_OWNER}/{GITHUB_REPO})"
+PROGRESS_MAX_RATE_HZ = 20.0
+PDF_TEXT_BACKEND = "pypdf2"
+BARCODE_COPY_WORKERS = 4
+BARCODE_COPY_MODE = "copy"
+PROCESS_POOL_SIZE = max(1, min((os.cpu_count() or 2) - 1, 4))
+PROCESS_CANCEL_GRACE_SECONDS = 1.0
+# Modulonkénti végrehajtás: "thread" (QThread a GUI processzben) vagy
+# "process" (előre indított worker processz, lásd process_pool)
+MODULE_EXECUTORS = {
+    "ksh": "process",
+    "cofanet": "process",
+    "merkantil": "thread",
+    "barcode_pdf": "thread",
+}
+JOB_MEMORY_LIMIT_MB = None
+# Sorban álló feladatok sorrendje: a nagyobb prioritású modul előbb indul
+# (azonos prioritásnál érkezési sorrend)
+MODULE_PRIORITIES = {
+    "barcode_pdf": 2,
+    "cofanet": 1,
+    "ksh": 1,
+    "merkantil": 0,
+}
+# Egyszerre futó modul feladatok száma (a többi sorban vár)
+JOB_MAX_CONCURRENCY = max(1, (os.cpu_count() or 2) // 2)
+# Feladatonkénti munkamappák: projekt work/ mappája vagy (True esetén) a
+# WORKSPACE_TEMP_DIR / rendszer temp mappa
+WORKSPACE_USE_TEMP = False
+WORKSPACE_TEMP_DIR = None
+# Profilozott futás: ennyi függvény kerül a szöveges összesítőbe
+PROFILE_TOP_N = 40
+# GUI blokkolás figyelő: heartbeat időköz és a naplózási küszöb (ms)
+STALL_WATCHDOG_ENABLED = True
+STALL_HEARTBEAT_MS = 100
+STALL_THRESHOLD_MS = 500
+# Részeredmények (élő előnézet): GUI frissítés gyakorisága és a megjelenített sorok száma
+PARTIAL_MAX_RATE_HZ = 4.0
+PREVIEW_MAX_ROWS = 2000
+# Modulonként ennyi legutóbbi output/<modul>/<futás> mappa marad meg
+PUBLISHED_RUNS_KEEP = 20
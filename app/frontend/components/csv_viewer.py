@@ -4,13 +4,12 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QKeySequence, QShortcut
 import csv
-import shutil
-import os
 
+from app.backend.services.workspace_service import remove_published_dir
 from app.frontend.theme import get_dark_theme_stylesheet
 
 class CSVViewer(QDialog):
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, cleanup_dir=None):
         super().__init__()
         self.setWindowTitle("Feldolgozott adatok")
         self.resize(900, 600)
@@ -25,7 +24,8 @@ class CSVViewer(QDialog):
         QShortcut(QKeySequence.Copy, self.table, self.copy_selection)
 
         self.load_csv(csv_path)
-        self.output_dir = os.path.dirname(os.path.abspath(csv_path))
+        # Csak a futás saját output mappája törlődik bezáráskor (ha megadták)
+        self.cleanup_dir = cleanup_dir
 
         # Apply dark theme
         self.setStyleSheet(get_dark_theme_stylesheet() + """
@@ -87,9 +87,8 @@ class CSVViewer(QDialog):
         QApplication.clipboard().setText("\n".join(copied_lines))
 
     def closeEvent(self, event):
-        if os.path.exists(self.output_dir) and os.path.isdir(self.output_dir):
-            try:
-                shutil.rmtree(self.output_dir)
-            except Exception as e:
-                print(f"Nem sikerült törölni az output mappát: {e}")
+        try:
+            remove_published_dir(self.cleanup_dir)
+        except Exception as e:
+            print(f"Nem sikerült törölni az output mappát: {e}")
         event.accept()
\ No newline at end of file
@@ -0,0 +1,144 @@
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QGroupBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from app.backend.workers.job_scheduler import MAX_FINISHED_JOBS, JobScheduler, JobState
+
+COLUMNS = ["#", "Feladat", "Állapot", "Várakozás", "Futási idő", "Üzenet"]
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return ""
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}:{secs:02d}" if minutes else f"{seconds:.1f} mp"
+
+
+class JobsPanel(QGroupBox):
+    """A JobScheduler sorban álló, futó és lezárult feladatai."""
+
+    def __init__(self, scheduler: JobScheduler | None = None, parent=None):
+        super().__init__("🗂 Feladatok", parent)
+        self.scheduler = scheduler or JobScheduler.instance()
+        self._rows = {}
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(len(COLUMNS) - 1, QHeaderView.ResizeMode.Stretch)
+
+        self.summary_label = QLabel()
+        self.cancel_btn = QPushButton("Megszakítás")
+        self.cancel_btn.setToolTip("A kijelölt sorban álló vagy futó feladat megszakítása")
+        self.cancel_btn.clicked.connect(self.cancel_selected)
+        self.profile_check = QCheckBox("Profilozás")
+        self.profile_check.setToolTip(
+            "Az ezután indított feladatok cProfile alatt futnak; a profil és "
+            "a szöveges összesítő a logs/profiles mappába kerül"
+        )
+        self.profile_check.setChecked(self.scheduler.profile_enabled)
+        self.profile_check.toggled.connect(self._set_profile_enabled)
+
+        bottom = QHBoxLayout()
+        bottom.addWidget(self.summary_label, 1)
+        bottom.addWidget(self.profile_check, 0)
+        bottom.addWidget(self.cancel_btn, 0)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addLayout(bottom)
+        self.setLayout(layout)
+
+        for job in self.scheduler.jobs:
+            self._add_job(job)
+        self.scheduler.job_added.connect(self._add_job)
+        self.scheduler.job_changed.connect(self._update_job)
+
+        # A futó feladatok ideje másodpercenként frissül
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._refresh_running)
+        self._timer.start(1000)
+        self._update_summary()
+
+    def _add_job(self, job):
+        row = 0
+        self.table.insertRow(row)
+        self._rows = {j: r + 1 for j, r in self._rows.items()}
+        self._rows[job] = row
+        for column in range(len(COLUMNS)):
+            self.table.setItem(row, column, QTableWidgetItem())
+        self.table.item(row, 0).setData(Qt.ItemDataRole.UserRole, job.id)
+        self._update_job(job)
+        self._drop_old_rows()
+
+    def _drop_old_rows(self):
+        last = self.table.rowCount() - 1
+        while last >= MAX_FINISHED_JOBS:
+            job = next((j for j, r in self._rows.items() if r == last), None)
+            if job is None or not job.is_done:
+                break
+            self.table.removeRow(last)
+            del self._rows[job]
+            last -= 1
+
+    def _update_job(self, job):
+        row = self._rows.get(job)
+        if row is None:
+            return
+        state = job.state
+        position = self.scheduler.queue_position(job)
+        if position is not None:
+            state = f"{state} ({position}.)"
+        values = [
+            str(job.id),
+            job.title,
+            state,
+            format_seconds(job.wait_seconds),
+            format_seconds(job.run_seconds),
+            job.message,
+        ]
+        for column, value in enumerate(values):
+            self.table.item(row, column).setText(value)
+        self._update_summary()
+
+    def _refresh_running(self):
+        for job in self._rows:
+            if job.state in (JobState.RUNNING, JobState.QUEUED):
+                self._update_job(job)
+
+    def _update_summary(self):
+        queued = sum(1 for job in self._rows if job.state == JobState.QUEUED)
+        self.summary_label.setText(
+            f"Fut: {self.scheduler.running_count()}/{self.scheduler.max_concurrency}, "
+            f"sorban: {queued}"
+        )
+
+    def _set_profile_enabled(self, enabled):
+        self.scheduler.profile_enabled = enabled
+
+    def selected_job(self):
+        row = self.table.currentRow()
+        for job, job_row in self._rows.items():
+            if job_row == row:
+                return job
+        return None
+
+    def cancel_selected(self):
+        job = self.selected_job()
+        if job is not None and not job.is_done:
+            self.scheduler.cancel(job)
@@ -0,0 +1,84 @@
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QGroupBox,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from app.config.settings import PREVIEW_MAX_ROWS
+
+
+class LivePreviewPanel(QGroupBox):
+    """
+    Egy futó feladat részeredményeinek (BackgroundTask on_started /
+    on_partial) folyamatosan bővülő táblázata. Legfeljebb max_rows sor
+    jelenik meg, a beérkezett sorok száma ennél több is lehet.
+    """
+
+    def __init__(
+        self,
+        title: str = "🔎 Élő előnézet",
+        max_rows: int = PREVIEW_MAX_ROWS,
+        parent=None,
+    ):
+        super().__init__(title, parent)
+        self.max_rows = max_rows
+        self.received_rows = 0
+        self._header = None
+        self._job_id = None
+
+        self.table = QTableWidget(0, 0)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectItems)
+        self.table.setMinimumHeight(160)
+        self.count_label = QLabel()
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addWidget(self.count_label)
+        self.setLayout(layout)
+        self.setVisible(False)
+
+    def start(self, job_id: int):
+        """
+        Egy feladat elindult: a tábla ürül, és ettől kezdve csak ennek a
+        feladatnak a sorai jelennek meg (egy korábbi, még futóé nem).
+        """
+        self._job_id = job_id
+        self._reset()
+        self.count_label.setText("Várakozás az első sorokra...")
+        self.setVisible(True)
+
+    def _reset(self):
+        self.received_rows = 0
+        self._header = None
+        self.table.setRowCount(0)
+        self.table.setColumnCount(0)
+
+    def append(self, job_id: int, header: list, rows: list):
+        if job_id != self._job_id:
+            return
+        if header != self._header:
+            # Más fejlécű köteg (pl. új szakasz): a tábla újrakezdődik
+            self._reset()
+            self._header = list(header)
+            self.table.setColumnCount(len(header))
+            self.table.setHorizontalHeaderLabels([str(h) for h in header])
+        self.received_rows += len(rows)
+        start = self.table.rowCount()
+        rows = rows[: max(0, self.max_rows - start)]
+        if rows:
+            self.table.setUpdatesEnabled(False)
+            self.table.setRowCount(start + len(rows))
+            for offset, row in enumerate(rows):
+                for column, value in enumerate(row[: len(header)]):
+                    self.table.setItem(start + offset, column, QTableWidgetItem(str(value)))
+            self.table.setUpdatesEnabled(True)
+            if start == 0:
+                self.table.resizeColumnsToContents()
+            self.table.scrollToBottom()
+        shown = self.table.rowCount()
+        suffix = f" (az első {shown} látható)" if self.received_rows > shown else ""
+        self.count_label.setText(f"Beérkezett sorok: {self.received_rows}{suffix}")
@@ -3,6 +3,7 @@ from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QLabel, QMessageBox, QPushButton, QVBoxLayout, QWidget
 
 from app.backend.services.update_service import read_local_version_info
+from app.frontend.components.jobs_panel import JobsPanel
 from app.frontend.routes import ROUTES, AppRoute
 from app.frontend.theme import get_action_button_stylesheet, get_dark_theme_stylesheet
 from app.resources.resource_path import resource_path
@@ -40,6 +41,8 @@ class MainWindow(QWidget):
             btn.clicked.connect(lambda _, r=route: self.open_route(r))
             layout.addWidget(btn)
         layout.addStretch()
+        self.jobs_panel = JobsPanel()
+        layout.addWidget(self.jobs_panel)
         layout.addWidget(self.version_label, alignment=Qt.AlignRight)
         self.setLayout(layout)
 
@@ -15,7 +15,13 @@ from PySide6.QtWidgets import (
 from app.backend.modules.barcode_pdf.service import copy_matching_pdfs
 
 from app.frontend.components.drag_drop_line_edit import DragDropLineEdit
+from app.frontend.components.live_preview import LivePreviewPanel
 from app.backend.workers.background_task import BackgroundTask
+from app.config.settings import (
+    JOB_MEMORY_LIMIT_MB,
+    MODULE_EXECUTORS,
+    MODULE_PRIORITIES,
+)
 from app.frontend.theme import (
     get_action_button_stylesheet,
     get_browse_button_stylesheet,
@@ -32,8 +38,8 @@ class BarcodeCopierWindow(QWidget):
         self.setMinimumWidth(320)
         self.setMinimumHeight(220)
 
-        self.excel_path_input = DragDropLineEdit(allowed_extensions=[".xlsx", ".xls"])
-        self.excel_path_input.setPlaceholderText("Húzd ide az Excel fájlt, vagy tallózz...")
+        self.excel_path_input = DragDropLineEdit(allowed_extensions=[".xlsx", ".xls", ".csv", ".txt"])
+        self.excel_path_input.setPlaceholderText("Húzd ide az Excel / CSV / TXT fájlt, vagy tallózz...")
         self.excel_browse_btn = QPushButton("📂")
         self.excel_browse_btn.setMaximumWidth(45)
         self.excel_browse_btn.setToolTip("Tallózás az Excel fájlhoz")
@@ -83,11 +89,15 @@ class BarcodeCopierWindow(QWidget):
         layout.setContentsMargins(16, 16, 16, 16)
         layout.addWidget(input_group)
         layout.addWidget(self.copy_btn)
+        # Futás közben a részeredmények itt jelennek meg
+        self.preview = LivePreviewPanel()
+        layout.addWidget(self.preview)
 
         self.setLayout(layout)
         self.setStyleSheet(get_dark_theme_stylesheet())
 
-        self._copy_task = None
+        # A sorba állított és futó feladatok (allow_queue: több is lehet)
+        self._copy_tasks = []
 
     def _create_row(self, label_text, input_widget, button_widget):
         row = QHBoxLayout()
@@ -98,7 +108,7 @@ class BarcodeCopierWindow(QWidget):
 
     def browse_excel(self):
         path, _ = QFileDialog.getOpenFileName(
-            self, "Excel fájl kiválasztása", "", "Excel fájlok (*.xlsx *.xls)"
+            self, "Excel fájl kiválasztása", "", "Vonalkód listák (*.xlsx *.xls *.csv *.txt)"
         )
         if path:
             self.excel_path_input.setText(path)
@@ -130,7 +140,7 @@ class BarcodeCopierWindow(QWidget):
             QMessageBox.warning(self, "Hiányzó kimenet", "Válassz kimeneti mappát.")
             return
 
-        self._copy_task = BackgroundTask(
+        task = BackgroundTask(
             self,
             self.copy_btn,
             "PDF másolás",
@@ -138,9 +148,15 @@ class BarcodeCopierWindow(QWidget):
             (excel_path, pdf_folder, output_folder),
             self._on_copy_result,
             self._on_copy_error,
-            self._on_copy_finished,
+            lambda: self._on_copy_finished(task),
+            executor=MODULE_EXECUTORS.get("barcode_pdf"),
+            memory_limit_mb=JOB_MEMORY_LIMIT_MB,
+            priority=MODULE_PRIORITIES.get("barcode_pdf", 0),
+            on_started=self.preview.start,
+            on_partial=self.preview.append,
         )
-        self._copy_task.start()
+        self._copy_tasks.append(task)
+        task.start()
 
     def _on_copy_result(self, result):
         copied = result.get("copied_count", 0)
@@ -155,7 +171,11 @@ class BarcodeCopierWindow(QWidget):
         QMessageBox.information(
             self,
             "Siker",
-            f"{copied} PDF fájl sikeresen átmásolva.\nHiányzó PDF-ek száma: {missing}",
+            f"{copied} PDF fájl sikeresen átmásolva.\nHiányzó PDF-ek száma: {missing}\n"
+            f"Már naprakész (kihagyva): {result.get('skipped_count', 0)}\n"
+            f"Korábbi munkamenetből átvéve: {result.get('resumed_count', 0)}\n"
+            f"Sebesség: {result.get('mb_per_sec', 0.0):.1f} MB/s, "
+            f"{result.get('files_per_sec', 0.0):.1f} fájl/s",
         )
 
     def _on_copy_error(self, error_message):
@@ -165,10 +185,11 @@ class BarcodeCopierWindow(QWidget):
             f"Hiba történt a másolás során:\n{error_message}",
         )
 
-    def _on_copy_finished(self):
-        self._copy_task = None
+    def _on_copy_finished(self, task):
+        if task in self._copy_tasks:
+            self._copy_tasks.remove(task)
 
     def closeEvent(self, event):
-        if self._copy_task is not None:
-            self._copy_task.cancel()
+        for task in list(self._copy_tasks):
+            task.cancel()
         event.accept()
@@ -18,6 +18,11 @@ from app.backend.modules.cofanet.service import process_cofanet_files
 
 from app.frontend.components.drag_drop_line_edit import DragDropLineEdit
 from app.backend.workers.background_task import BackgroundTask
+from app.config.settings import (
+    JOB_MEMORY_LIMIT_MB,
+    MODULE_EXECUTORS,
+    MODULE_PRIORITIES,
+)
 from app.frontend.theme import (
     get_action_button_stylesheet,
     get_browse_button_stylesheet,
@@ -91,7 +96,8 @@ class CofanetHelpUI(QWidget):
         self.setLayout(layout)
         self.setStyleSheet(get_dark_theme_stylesheet())
 
-        self._process_task = None
+        # A sorba állított és futó feladatok (allow_queue: több is lehet)
+        self._process_tasks = []
 
     def _create_row(self, label_text, input_widget, button_widget):
         row = QHBoxLayout()
@@ -150,7 +156,7 @@ class CofanetHelpUI(QWidget):
             )
             return
 
-        self._process_task = BackgroundTask(
+        task = BackgroundTask(
             self,
             self.process_btn,
             "Cofanet feldolgozás",
@@ -158,9 +164,13 @@ class CofanetHelpUI(QWidget):
             (sap_path, coface_excel_path, eur_rate, save_path),
             self._on_process_result,
             self._on_process_error,
-            self._on_process_finished,
+            lambda: self._on_process_finished(task),
+            executor=MODULE_EXECUTORS.get("cofanet"),
+            memory_limit_mb=JOB_MEMORY_LIMIT_MB,
+            priority=MODULE_PRIORITIES.get("cofanet", 0),
         )
-        self._process_task.start()
+        self._process_tasks.append(task)
+        task.start()
 
     def _on_process_result(self, result):
         if result.get("cancelled"):
@@ -172,7 +182,7 @@ class CofanetHelpUI(QWidget):
         QMessageBox.information(
             self,
             "Sikeres feldolgozás",
-            f"Sikeres feldolgozás! {rows_count} vevő sor írva: output/vevok.csv\n"
+            f"Sikeres feldolgozás! {rows_count} vevő sor írva: {result.get('vevok_csv_path')}\n"
             f"Coface Excel kitöltve: {coface_output_path}",
         )
         if coface_output_path:
@@ -181,8 +191,9 @@ class CofanetHelpUI(QWidget):
     def _on_process_error(self, error_message):
         QMessageBox.critical(self, "Hiba", f"Hiba történt: {error_message}")
 
-    def _on_process_finished(self):
-        self._process_task = None
+    def _on_process_finished(self, task):
+        if task in self._process_tasks:
+            self._process_tasks.remove(task)
 
     def _open_output_file(self, output_path):
         try:
@@ -196,6 +207,6 @@ class CofanetHelpUI(QWidget):
             pass
 
     def closeEvent(self, event):
-        if self._process_task is not None:
-            self._process_task.cancel()
+        for task in list(self._process_tasks):
+            task.cancel()
         event.accept()
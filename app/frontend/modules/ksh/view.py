@@ -17,6 +17,11 @@ from app.backend.modules.ksh.service import Processor
 
 from app.frontend.components.drag_drop_line_edit import DragDropLineEdit
 from app.backend.workers.background_task import BackgroundTask
+from app.config.settings import (
+    JOB_MEMORY_LIMIT_MB,
+    MODULE_EXECUTORS,
+    MODULE_PRIORITIES,
+)
 from app.frontend.theme import (
     get_action_button_stylesheet,
     get_browse_button_stylesheet,
@@ -71,7 +76,8 @@ class MainUI(QWidget):
         self.processor = Processor()
         self.setStyleSheet(get_dark_theme_stylesheet())
 
-        self._process_task = None
+        # A sorba állított és futó feladatok (allow_queue: több is lehet)
+        self._process_tasks = []
 
     def _row(self, label_text, input_widget, button_widget):
         row = QHBoxLayout()
@@ -126,7 +132,7 @@ class MainUI(QWidget):
             )
             return
 
-        self._process_task = BackgroundTask(
+        task = BackgroundTask(
             self,
             self.process_btn,
             "KSH feldolgozás",
@@ -134,9 +140,13 @@ class MainUI(QWidget):
             (ksh, mat, save_path),
             self._on_process_result,
             self._on_process_error,
-            self._on_process_finished,
+            lambda: self._on_process_finished(task),
+            executor=MODULE_EXECUTORS.get("ksh"),
+            memory_limit_mb=JOB_MEMORY_LIMIT_MB,
+            priority=MODULE_PRIORITIES.get("ksh", 0),
         )
-        self._process_task.start()
+        self._process_tasks.append(task)
+        task.start()
 
     def _on_process_result(self, result):
         if result.get("cancelled"):
@@ -154,10 +164,11 @@ class MainUI(QWidget):
     def _on_process_error(self, error_message):
         QMessageBox.critical(self, "Hiba", f"Hiba történt:\n{error_message}")
 
-    def _on_process_finished(self):
-        self._process_task = None
+    def _on_process_finished(self, task):
+        if task in self._process_tasks:
+            self._process_tasks.remove(task)
 
     def closeEvent(self, event):
-        if self._process_task is not None:
-            self._process_task.cancel()
+        for task in list(self._process_tasks):
+            task.cancel()
         event.accept()
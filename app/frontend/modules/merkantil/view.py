@@ -1,8 +1,10 @@
 import os
 import sys
+from functools import partial
 
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
+    QCheckBox,
     QFileDialog,
     QGroupBox,
     QHBoxLayout,
@@ -13,11 +15,18 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from app.backend.modules.merkantil.service import run
+from app.backend.modules.merkantil.batch import run_batch
+from app.backend.modules.merkantil.service import EARLY_STOP_EMPTY_PAGES, run
 from app.frontend.components.csv_viewer import CSVViewer
 from app.frontend.components.drag_drop_line_edit import DragDropLineEdit
+from app.frontend.components.live_preview import LivePreviewPanel
 
 from app.backend.workers.background_task import BackgroundTask
+from app.config.settings import (
+    JOB_MEMORY_LIMIT_MB,
+    MODULE_EXECUTORS,
+    MODULE_PRIORITIES,
+)
 from app.frontend.theme import (
     get_action_button_stylesheet,
     get_browse_button_stylesheet,
@@ -35,8 +44,10 @@ class MainUI(QWidget):
         self.setMinimumHeight(220)
 
         # PDF fájl sor
-        self.pdf_path_input = DragDropLineEdit(allowed_extensions=[".pdf"])
-        self.pdf_path_input.setPlaceholderText("Húzd ide a PDF fájlt, vagy tallózz...")
+        self.pdf_path_input = DragDropLineEdit(allowed_extensions=[".pdf"], allow_folder=True)
+        self.pdf_path_input.setPlaceholderText(
+            "Húzd ide a PDF fájlt vagy PDF mappát, vagy tallózz..."
+        )
         self.pdf_browse_btn = QPushButton("📂")
         self.pdf_browse_btn.setMaximumWidth(45)
         self.pdf_browse_btn.setToolTip("Tallózás a PDF fájlhoz")
@@ -52,6 +63,14 @@ class MainUI(QWidget):
         self.xlsx_browse_btn.setStyleSheet(get_browse_button_stylesheet())
         self.xlsx_browse_btn.clicked.connect(self.browse_xlsx)
 
+        # Gyors olvasás: opcionális, mert egy hosszabb autó nélküli szakasz
+        # után a PDF további autói kimaradhatnak
+        self.fast_read_check = QCheckBox("Gyors olvasás (autó nélküli záró oldalak kihagyása)")
+        self.fast_read_check.setToolTip(
+            f"{EARLY_STOP_EMPTY_PAGES} egymást követő autó nélküli oldal után az olvasás "
+            "leáll, és az azonos elrendezésű PDF-ek záró oldalai kimaradnak."
+        )
+
         # Feldolgozás gomb
         self.process_btn = QPushButton("⚙️ Feldolgozás")
         self.process_btn.setMinimumHeight(36)
@@ -68,6 +87,7 @@ class MainUI(QWidget):
         input_layout.addLayout(
             self._create_row("Autók Excel:", self.xlsx_path_input, self.xlsx_browse_btn)
         )
+        input_layout.addWidget(self.fast_read_check)
         input_group.setLayout(input_layout)
 
         layout = QVBoxLayout()
@@ -75,11 +95,15 @@ class MainUI(QWidget):
         layout.setContentsMargins(16, 16, 16, 16)
         layout.addWidget(input_group)
         layout.addWidget(self.process_btn)
+        # Futás közben a részeredmények itt jelennek meg
+        self.preview = LivePreviewPanel()
+        layout.addWidget(self.preview)
 
         self.setLayout(layout)
         self.setStyleSheet(get_dark_theme_stylesheet())
 
-        self._process_task = None
+        # A sorba állított és futó feladatok (allow_queue: több is lehet)
+        self._process_tasks = []
 
     def _create_row(self, label_text, input_widget, button_widget):
         row = QHBoxLayout()
@@ -106,8 +130,9 @@ class MainUI(QWidget):
     def process_file(self):
         pdf_path = self.pdf_path_input.text().strip()
         xlsx_path = self.xlsx_path_input.text().strip()
-        if not pdf_path or not os.path.isfile(pdf_path):
-            QMessageBox.warning(self, "Nincs PDF", "Válassz létező PDF fájlt.")
+        is_batch = bool(pdf_path) and os.path.isdir(pdf_path)
+        if not pdf_path or not (is_batch or os.path.isfile(pdf_path)):
+            QMessageBox.warning(self, "Nincs PDF", "Válassz létező PDF fájlt vagy mappát.")
             return
         if not xlsx_path or not os.path.isfile(xlsx_path):
             QMessageBox.warning(
@@ -115,41 +140,67 @@ class MainUI(QWidget):
             )
             return
 
-        self._process_task = BackgroundTask(
+        func = run_batch if is_batch else run
+        if self.fast_read_check.isChecked():
+            func = partial(
+                func, early_stop_pages=EARLY_STOP_EMPTY_PAGES, remember_page_range=True
+            )
+        task = BackgroundTask(
             self,
             self.process_btn,
             "PDF feldolgozás",
-            run,
+            func,
             (pdf_path, xlsx_path),
             self._on_process_result,
             self._on_process_error,
-            self._on_process_finished,
+            lambda: self._on_process_finished(task),
+            executor=MODULE_EXECUTORS.get("merkantil"),
+            memory_limit_mb=JOB_MEMORY_LIMIT_MB,
+            priority=MODULE_PRIORITIES.get("merkantil", 0),
+            on_started=self.preview.start,
+            on_partial=self.preview.append,
         )
-        self._process_task.start()
+        self._process_tasks.append(task)
+        task.start()
 
     def _on_process_result(self, result):
         if result.get("cancelled"):
             QMessageBox.information(self, "Megszakítva", "A feldolgozás megszakítva.")
             return
 
-        output_csv_path = result.get("output_csv")
         vehicle_count = result.get("vehicle_count", 0)
-        QMessageBox.information(
-            self,
-            "Siker",
-            f"A feldolgozás sikeresen lefutott. Feldolgozott autók: {vehicle_count}",
-        )
+        if "files" in result:
+            output_csvs = result.get("output_csvs") or []
+            output_csv_path = output_csvs[0] if len(output_csvs) == 1 else None
+            file_lines = "\n".join(
+                f"{os.path.basename(f['pdf_path'])}: {f['vehicle_count']} autó, {f['seconds']:.1f} mp"
+                for f in result["files"]
+            )
+            QMessageBox.information(
+                self,
+                "Siker",
+                f"A feldolgozás sikeresen lefutott. Feldolgozott autók: {vehicle_count}\n\n"
+                f"{file_lines}",
+            )
+        else:
+            output_csv_path = result.get("output_csv")
+            QMessageBox.information(
+                self,
+                "Siker",
+                f"A feldolgozás sikeresen lefutott. Feldolgozott autók: {vehicle_count}",
+            )
         if output_csv_path:
-            viewer = CSVViewer(output_csv_path)
+            viewer = CSVViewer(output_csv_path, cleanup_dir=result.get("output_dir"))
             viewer.exec()
 
     def _on_process_error(self, error_message):
         QMessageBox.critical(self, "Hiba", f"Hiba történt:\n{error_message}")
 
-    def _on_process_finished(self):
-        self._process_task = None
+    def _on_process_finished(self, task):
+        if task in self._process_tasks:
+            self._process_tasks.remove(task)
 
     def closeEvent(self, event):
-        if self._process_task is not None:
-            self._process_task.cancel()
+        for task in list(self._process_tasks):
+            task.cancel()
         event.accept()
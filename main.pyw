@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 import subprocess
 
@@ -17,6 +18,10 @@ def main():
     splash = QSplashScreen(pixmap, Qt.WindowStaysOnTopHint)
     splash.setFont(QFont("Arial", 12, QFont.Bold))
     splash.show()
+
+    # A GUI szál blokkolásai (pl. indításkori hálózati hívás) a logs/app.log-ba kerülnek
+    from app.backend.workers.stall_watchdog import start_stall_watchdog
+    start_stall_watchdog(qt_app)
     
     # 1. Lépés: Gyors frissítéskeresés
     splash.showMessage("Frissítések keresése...", Qt.AlignBottom | Qt.AlignCenter, Qt.white)
@@ -73,10 +78,19 @@ def main():
 
     window = MainWindow()
     window.show()
+
+    # A processz módban futó modulok worker processzei előre elindulnak
+    from app.backend.workers.process_pool import PROCESS_EXECUTOR, start_process_pool
+    from app.config.settings import MODULE_EXECUTORS
+
+    if PROCESS_EXECUTOR in MODULE_EXECUTORS.values():
+        start_process_pool()
     
     splash.finish(window)
     return qt_app.exec()
 
 
 if __name__ == "__main__":
+    # PyInstaller alatt a worker processzek is ezt a belépési pontot futtatják
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -0,0 +1,79 @@
+import itertools
+import os
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from app.backend.modules.barcode_pdf.service import _copy_jobs
+
+
+def _make_jobs(tmp_path, count=20):
+    source_dir = tmp_path / "pdf"
+    output_dir = tmp_path / "out"
+    source_dir.mkdir()
+    output_dir.mkdir()
+    jobs = []
+    for index in range(count):
+        barcode = f"{index:010d}"
+        source = source_dir / f"{barcode}.pdf"
+        source.write_bytes(b"%PDF-1.4 " + barcode.encode())
+        jobs.append((barcode, str(source), str(output_dir / source.name)))
+    return jobs, output_dir
+
+
+def _cancel_after(calls):
+    counter = itertools.count(1)
+    return lambda: next(counter) > calls
+
+
+def test_cancel_during_copy_is_reported(tmp_path):
+    jobs, output_dir = _make_jobs(tmp_path)
+    result = _copy_jobs(jobs, [], 4, None, _cancel_after(5))
+    copied = len(os.listdir(output_dir))
+    assert result["cancelled"]
+    assert result["copied_count"] == copied < len(jobs)
+
+
+def test_full_copy_is_not_cancelled(tmp_path):
+    jobs, output_dir = _make_jobs(tmp_path)
+    result = _copy_jobs(jobs, [], 4, None, lambda: False)
+    assert not result["cancelled"]
+    assert result["copied_count"] == len(jobs) == len(os.listdir(output_dir))
+
+
+@pytest.fixture
+def copy_env(tmp_path, monkeypatch):
+    from app.backend.modules.barcode_pdf import service
+    from app.backend.modules.barcode_pdf.pdf_index import PdfIndexCache
+    from app.backend.services import perf_service
+
+    monkeypatch.setattr(perf_service, "PERF_LOG_PATH", tmp_path / "perf.jsonl")
+    monkeypatch.setattr(service, "PDF_INDEX_CACHE", PdfIndexCache(tmp_path / "index.json"))
+    jobs, output_dir = _make_jobs(tmp_path)
+    barcodes = [barcode for barcode, _, _ in jobs]
+    monkeypatch.setattr(service, "read_barcodes", lambda path: barcodes)
+    return service, str(tmp_path / "pdf"), str(output_dir), len(jobs)
+
+
+def test_cancelled_copy_resumes_from_journal(copy_env):
+    service, pdf_folder, output_folder, total = copy_env
+    first = service.copy_matching_pdfs(
+        "lista.txt", pdf_folder, output_folder, is_cancelled=_cancel_after(5), workers=4
+    )
+    assert first["cancelled"]
+
+    second = service.copy_matching_pdfs(
+        "lista.txt", pdf_folder, output_folder, is_cancelled=lambda: False, workers=4
+    )
+    assert not second["cancelled"]
+    assert second["sessions"] == 2
+    assert second["resumed_count"] == first["copied_count"]
+    assert second["copied_count"] == total == len(
+        [name for name in os.listdir(output_folder) if name.endswith(".pdf")]
+    )
+
+    # A befejezett napló után új munkamenet kezdődik
+    third = service.copy_matching_pdfs("lista.txt", pdf_folder, output_folder)
+    assert third["sessions"] == 1
+    assert third["skipped_count"] == total
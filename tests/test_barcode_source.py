@@ -0,0 +1,30 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from app.backend.modules.barcode_pdf.barcode_source import _to_barcodes, read_barcodes
+
+
+def test_blank_excel_cells_are_not_barcodes():
+    # Egy üres "Szöveg" cella NaN-ként érkezik az Excelből
+    values = pd.Series(["1234567890123", float("nan"), "", "  ", "0987654321"])
+    assert sorted(_to_barcodes(values).tolist()) == ["0987654321", "1234567890"]
+
+
+def test_excel_with_blank_row(tmp_path):
+    pytest.importorskip("python_calamine")
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "lista.xlsx"
+    pd.DataFrame({"Szöveg": ["1234567890AB", None, "0987654321"]}).to_excel(
+        path, index=False
+    )
+    assert read_barcodes(str(path)) == ["0987654321", "1234567890"]
+
+
+def test_csv_and_txt_skip_blank_values(tmp_path):
+    csv_path = tmp_path / "lista.csv"
+    csv_path.write_text("Szöveg;Egyéb\n1234567890AB;x\n;y\n0987654321;z\n", encoding="utf-8")
+    txt_path = tmp_path / "lista.txt"
+    txt_path.write_text("1234567890AB\n\n   \n0987654321\n", encoding="utf-8")
+    assert read_barcodes(str(csv_path)) == ["0987654321", "1234567890"]
+    assert read_barcodes(str(txt_path)) == ["0987654321", "1234567890"]
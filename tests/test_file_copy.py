@@ -0,0 +1,29 @@
+import os
+
+from app.backend.modules.barcode_pdf.file_copy import LINK_MODE, copy_file
+
+
+def test_link_mode_rerun_leaves_no_temp_files(tmp_path):
+    source = tmp_path / "1234567890.pdf"
+    source.write_bytes(b"%PDF-1.4")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    target = output_dir / source.name
+
+    for _ in range(2):
+        copy_file(str(source), str(target), source.stat().st_size, LINK_MODE)
+
+    assert os.listdir(output_dir) == [source.name]
+    assert target.read_bytes() == b"%PDF-1.4"
+
+
+def test_link_mode_replaces_an_older_copy(tmp_path):
+    source = tmp_path / "1234567890.pdf"
+    source.write_bytes(b"%PDF-1.4 uj")
+    target = tmp_path / "out.pdf"
+    target.write_bytes(b"regi")
+
+    copy_file(str(source), str(target), source.stat().st_size, LINK_MODE)
+
+    assert target.read_bytes() == b"%PDF-1.4 uj"
+    assert sorted(os.listdir(tmp_path)) == ["1234567890.pdf", "out.pdf"]
@@ -0,0 +1,31 @@
+from app.backend.modules.cofanet.match_cache import MatchCache
+
+
+def test_legal_forms_do_not_share_a_match(tmp_path):
+    with MatchCache(tmp_path / "match.sqlite") as cache:
+        cache.bind(["Minta Kft.", "Minta Zrt."])
+        cache.store("Minta Kft.", "Minta Kft.")
+        assert cache.lookup("minta  KFT.") == (True, 0)
+        assert cache.lookup("Minta Zrt.") == (False, None)
+
+
+def test_match_is_dropped_when_the_coface_name_disappears(tmp_path):
+    path = tmp_path / "match.sqlite"
+    with MatchCache(path) as cache:
+        cache.bind(["Minta Kft.", "Egyéb Bt."])
+        cache.store("Minta Kft.", "Minta Kft.")
+    with MatchCache(path) as cache:
+        cache.bind(["Egyéb Bt.", "Minta Kft."])
+        assert cache.lookup("Minta Kft.") == (True, 1)
+        cache.bind(["Egyéb Bt."])
+        assert cache.lookup("Minta Kft.") == (False, None)
+        assert cache.lookup("Minta Kft.") == (False, None)
+
+
+def test_no_match_is_only_valid_for_the_same_list(tmp_path):
+    with MatchCache(tmp_path / "match.sqlite") as cache:
+        cache.bind(["Egyéb Bt."])
+        cache.store("Minta Kft.", None)
+        assert cache.lookup("Minta Kft.") == (True, None)
+        cache.bind(["Egyéb Bt.", "Minta Kft."])
+        assert cache.lookup("Minta Kft.") == (False, None)
@@ -0,0 +1,29 @@
+from app.backend.modules.merkantil.page_range import VehiclePageTracker
+
+
+def _read(tracker, pages):
+    return list(tracker.wrap(iter(pages)))
+
+
+def test_early_stop_does_not_report_tail_pages():
+    # Egy 3 oldalas autó nélküli szakasz után még jön autó
+    pages = ["auto", "", "", "", "auto", ""]
+    tracker = VehiclePageTracker(bool, stop_after=3)
+    assert _read(tracker, pages) == pages[:4]
+    assert tracker.stopped_early
+    assert tracker.tail_pages(page_count=len(pages) + 1) is None
+
+
+def test_full_read_reports_tail_pages():
+    pages = ["auto", "", "", "", "auto", "", ""]
+    tracker = VehiclePageTracker(bool)
+    assert _read(tracker, pages) == pages
+    assert not tracker.stopped_early
+    # start_page=2: a tracker 0. oldala a PDF 2. oldala
+    assert tracker.tail_pages(page_count=len(pages) + 1) == 2
+
+
+def test_no_vehicle_reports_no_tail_pages():
+    tracker = VehiclePageTracker(bool)
+    _read(tracker, ["", ""])
+    assert tracker.tail_pages(page_count=3) is None
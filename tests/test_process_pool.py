@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from app.backend.workers.process_pool import JobError, WarmProcessPool
+
+
+def _add(a, b, progress_callback=None, is_cancelled=None):
+    return a + b
+
+
+def _out_of_memory(progress_callback=None, is_cancelled=None):
+    raise MemoryError()
+
+
+@pytest.fixture
+def pool():
+    pool = WarmProcessPool(size=2, preload=())
+    yield pool
+    pool.shutdown()
+
+
+def test_run_returns_result(pool):
+    assert pool.run(_add, (2, 3)) == 5
+
+
+def test_memory_error_has_a_message(pool):
+    with pytest.raises(JobError) as info:
+        pool.run(_out_of_memory, memory_limit_mb=256)
+    assert str(info.value).startswith("A feladat túllépte a memóriakorlátot (256 MB).")
+
+
+def test_concurrent_start_does_not_exceed_size(pool):
+    threads = [threading.Thread(target=pool.start) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(pool._workers) == pool.size
+    assert pool._pending == 0